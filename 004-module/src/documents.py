@@ -0,0 +1,75 @@
+"""
+Declarative, vectorized builder for embedding text.
+"""
+from typing import Any, Mapping, Sequence
+import numpy as np
+import pandas as pd
+
+# Fields combined into the embedding text, in order
+HOTEL_FIELDS = ['name', 'type', 'category', 'amenities', 'review', 'title', 'address', 'awards']
+STOCK_FIELDS = ['symbol', 'name', 'sector', 'industry', 'market_cap']
+
+class DocumentBuilder:
+    """Build embedding text from a list of DataFrame fields.
+
+    Each field is converted to a string column, missing values (NaN, empty
+    strings or the literal string "nan") are dropped, and the remaining
+    values are joined with spaces. Columns absent from the DataFrame are
+    skipped. Per-field conversion and missing-value checks run column-wise
+    instead of through ``iterrows`` and per-row ``pd.notna`` calls.
+    """
+
+    def __init__(self, fields: Sequence[str], separator: str = " "):
+        """Initialize the builder.
+
+        Args:
+            fields: Column names to combine, in order
+            separator: String placed between non-empty fields
+        """
+        self.fields = list(fields)
+        self.separator = separator
+
+    def build(self, df: pd.DataFrame) -> pd.Series:
+        """Build the embedding text for every row.
+
+        Args:
+            df: DataFrame containing the configured fields
+
+        Returns:
+            Series of strings aligned with ``df.index``
+        """
+        columns = []
+        for field in self.fields:
+            if field not in df.columns:
+                continue
+            values = df[field].astype(str).to_numpy(dtype=object)
+            present = df[field].notna().to_numpy().copy()
+
+            # Only 3-character values can spell "nan"; lower-case just those
+            lengths = np.zeros(len(values), dtype=np.int64)
+            lengths[present] = np.fromiter(map(len, values[present]), dtype=np.int64, count=present.sum())
+            candidates = lengths == 3
+            if candidates.any():
+                present[candidates] = np.char.lower(values[candidates].astype('U3')) != 'nan'
+
+            columns.append(np.where(present, values, ""))
+
+        if not columns:
+            return pd.Series("", index=df.index, dtype=object)
+        return pd.Series(
+            [self.separator.join(filter(None, parts)) for parts in zip(*columns)],
+            index=df.index,
+            dtype=object
+        )
+
+    def build_one(self, row: Mapping[str, Any]) -> str:
+        """Build the embedding text for a single row or record.
+
+        Args:
+            row: DataFrame row or dictionary containing the configured fields
+
+        Returns:
+            Combined text string
+        """
+        return self.build(pd.DataFrame([dict(row)])).iloc[0]
+
@@ -0,0 +1,202 @@
+"""
+Pluggable inference backends for the sentence encoder.
+"""
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import sentence_transformers
+from sentence_transformers import SentenceTransformer
+
+# Supported backends: eager PyTorch fp32, exported ONNX graph, dynamically int8-quantized ONNX graph
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+
+# File names written by sentence_transformers.export_dynamic_quantized_onnx_model
+QUANTIZED_FILES = {
+    'arm64': 'model_qint8_arm64.onnx',
+    'avx2': 'model_quint8_avx2.onnx',
+    'avx512': 'model_qint8_avx512.onnx',
+    'avx512_vnni': 'model_qint8_avx512_vnni.onnx',
+}
+
+EXPORT_DIR = Path("storage") / "encoders"
+
+# ONNX backends need the `backend` argument and quantized export added in sentence-transformers 3.2
+ONNX_MIN_VERSION = (3, 2)
+ONNX_REQUIREMENT = "sentence-transformers[onnx]>=3.2"
+
+PARITY_SENTENCES = [
+    "luxury beachfront hotel with ocean view and spa",
+    "affordable hotel near downtown Miami with free parking",
+    "Apple Inc. Common Stock Technology Computer Manufacturing",
+    "family friendly resort with swimming pools and kids club",
+    "biotechnology company developing cancer therapies",
+]
+
+def get_default_backend() -> str:
+    """Get the encoder backend configured via ``EMBEDDING_BACKEND`` (default: torch)."""
+    return os.getenv("EMBEDDING_BACKEND", "torch")
+
+def get_model_key(model_name: str, backend: str) -> str:
+    """Get the key identifying embeddings produced by a model/backend pair.
+
+    Used as the model part of embedding cache keys, so vectors from
+    different backends are never mixed.
+    """
+    return model_name if backend == 'torch' else f"{model_name}@{backend}"
+
+def _check_onnx_support():
+    """Raise a clear error if the installed sentence-transformers can't run the ONNX backends."""
+    version = tuple(int(part) for part in re.findall(r'\d+', sentence_transformers.__version__)[:2])
+    if version < ONNX_MIN_VERSION:
+        raise ImportError(
+            f"The ONNX encoder backends require {ONNX_REQUIREMENT}, found sentence-transformers "
+            f"{sentence_transformers.__version__} (pip install '{ONNX_REQUIREMENT}')"
+        )
+    try:
+        import optimum.onnxruntime  # noqa: F401
+    except ImportError as e:
+        raise ImportError(f"The ONNX encoder backends require the onnx extra (pip install '{ONNX_REQUIREMENT}')") from e
+
+def _load_quantized(model_name: str, quantization: str) -> SentenceTransformer:
+    """Load an int8 ONNX graph, exporting one if the model doesn't ship it."""
+    file_name = f"onnx/{QUANTIZED_FILES[quantization]}"
+    try:
+        return SentenceTransformer(model_name, backend='onnx', model_kwargs={'file_name': file_name})
+    except Exception:
+        # No pre-quantized graph published for this model; quantize locally once
+        export_dir = EXPORT_DIR / model_name.replace("/", "__")
+        export_dir.mkdir(parents=True, exist_ok=True)
+        if not (export_dir / file_name).exists():
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+            onnx_model = SentenceTransformer(model_name, backend='onnx')
+            onnx_model.save(str(export_dir))
+            export_dynamic_quantized_onnx_model(onnx_model, quantization, str(export_dir))
+        return SentenceTransformer(str(export_dir), backend='onnx', model_kwargs={'file_name': file_name})
+
+def load_encoder(model_name: str = 'all-MiniLM-L6-v2', backend: Optional[str] = None) -> SentenceTransformer:
+    """Load a sentence encoder on the requested inference backend.
+
+    Args:
+        model_name: Name or path of the SentenceTransformer model
+        backend: One of ``BACKENDS``; defaults to ``EMBEDDING_BACKEND``.
+            The int8 variant uses the quantization target in
+            ``EMBEDDING_QUANTIZATION`` (default: avx2).
+
+    Returns:
+        SentenceTransformer running on the requested backend
+
+    Raises:
+        ValueError: If the backend is unknown
+        ImportError: If an ONNX backend is requested without ``sentence-transformers[onnx]>=3.2``
+    """
+    backend = backend or get_default_backend()
+    if backend == 'torch':
+        return SentenceTransformer(model_name)
+    if backend in ('onnx', 'onnx-int8'):
+        _check_onnx_support()
+    if backend == 'onnx':
+        return SentenceTransformer(model_name, backend='onnx')
+    if backend == 'onnx-int8':
+        return _load_quantized(model_name, os.getenv("EMBEDDING_QUANTIZATION", "avx2"))
+    raise ValueError(f"Unknown encoder backend '{backend}', expected one of {BACKENDS}")
+
+class SharedEncoder:
+    """Lazily loaded, thread-safe handle to a process-wide encoder.
+
+    The underlying model is loaded on first use. ``encode`` calls are
+    serialized because Hugging Face fast tokenizers can't be used from
+    several threads at once; other attributes (``tokenizer``,
+    ``max_seq_length``, multi-process pool helpers, ...) are delegated to
+    the loaded model.
+    """
+
+    def __init__(self, model_name: str, backend: str):
+        """Initialize the handle without loading the model.
+
+        Args:
+            model_name: Name or path of the SentenceTransformer model
+            backend: One of ``BACKENDS``
+        """
+        self.model_name = model_name
+        self.backend = backend
+        self._model = None
+        self._lock = threading.RLock()
+
+    @property
+    def model(self) -> SentenceTransformer:
+        """The loaded SentenceTransformer, loading it on first access."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = load_encoder(self.model_name, self.backend)
+        return self._model
+
+    def encode(self, *args, **kwargs):
+        """Thread-safe ``SentenceTransformer.encode``."""
+        model = self.model
+        with self._lock:
+            return model.encode(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+_encoders: Dict[Tuple[str, str], SharedEncoder] = {}
+_encoders_lock = threading.Lock()
+
+def get_encoder(model_name: str = 'all-MiniLM-L6-v2', backend: Optional[str] = None) -> SharedEncoder:
+    """Get the process-wide encoder for a model and backend.
+
+    Every engine asking for the same model and backend receives the same
+    instance, so weights are loaded once per process, on first use.
+
+    Args:
+        model_name: Name or path of the SentenceTransformer model
+        backend: One of ``BACKENDS``; defaults to ``EMBEDDING_BACKEND``
+
+    Returns:
+        Shared, lazily loaded encoder
+    """
+    key = (model_name, backend or get_default_backend())
+    with _encoders_lock:
+        if key not in _encoders:
+            _encoders[key] = SharedEncoder(*key)
+        return _encoders[key]
+
+def check_encoder_parity(encoder: SentenceTransformer, reference: SentenceTransformer,
+                         texts: Optional[List[str]] = None, min_cosine: float = 0.99) -> Dict[str, Any]:
+    """Compare an encoder backend against the reference model.
+
+    Args:
+        encoder: Encoder under test (e.g. ONNX or int8)
+        reference: Reference encoder (eager PyTorch fp32)
+        texts: Texts to compare on; defaults to a small built-in sample
+        min_cosine: Lowest per-text cosine similarity that counts as agreement
+
+    Returns:
+        Dictionary with min/mean cosine, per-backend encode seconds and
+        whether every text agreed (``passed``)
+    """
+    texts = texts or PARITY_SENTENCES
+
+    start = time.perf_counter()
+    candidate = encoder.encode(texts, normalize_embeddings=True)
+    encoder_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = reference.encode(texts, normalize_embeddings=True)
+    reference_seconds = time.perf_counter() - start
+
+    cosines = np.sum(np.asarray(candidate) * np.asarray(expected), axis=1)
+    return {
+        'min_cosine': float(cosines.min()),
+        'mean_cosine': float(cosines.mean()),
+        'encoder_seconds': encoder_seconds,
+        'reference_seconds': reference_seconds,
+        'passed': bool(cosines.min() >= min_cosine),
+    }
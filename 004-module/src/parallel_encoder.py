@@ -0,0 +1,95 @@
+"""
+Multi-process sentence encoding for large index builds.
+"""
+import os
+from typing import Optional
+import numpy as np
+
+class ParallelEncoder:
+    """Spread ``encode`` batches across a pool of CPU worker processes.
+
+    Wraps a SentenceTransformer and exposes the same ``encode`` method, so it
+    can be used anywhere the model is. With ``num_workers <= 1`` (the
+    default) calls go straight to the wrapped model.
+
+    Texts are sorted by length and cut into chunks that are a whole number
+    of batches, so every worker sees the same batches single-process
+    encoding would build. Results are returned in input order.
+
+    The pool is started on first use and stopped after each call, unless
+    the encoder is used as a context manager, in which case it is reused
+    until the block exits.
+    """
+
+    def __init__(self, model, num_workers: Optional[int] = 1, batches_per_chunk: int = 16,
+                 min_parallel_texts: int = 1000):
+        """Initialize the encoder.
+
+        Args:
+            model: SentenceTransformer to encode with
+            num_workers: Number of worker processes; None uses all CPU cores
+            batches_per_chunk: Number of batches sent to a worker at a time
+            min_parallel_texts: Inputs smaller than this are encoded in-process
+        """
+        self.model = model
+        self.num_workers = num_workers if num_workers is not None else (os.cpu_count() or 1)
+        self.batches_per_chunk = batches_per_chunk
+        self.min_parallel_texts = min_parallel_texts
+        self._pool = None
+        self._keep_pool = False
+
+    def __enter__(self) -> 'ParallelEncoder':
+        """Keep the worker pool alive across ``encode`` calls until exit."""
+        self._keep_pool = True
+        return self
+
+    def __exit__(self, *exc_info):
+        self._keep_pool = False
+        self.close()
+
+    def close(self):
+        """Stop the worker pool if one is running."""
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Get the embedding dimension of the wrapped model."""
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, batch_size: int = 32, **encode_kwargs) -> np.ndarray:
+        """Encode texts, using the worker pool for large inputs.
+
+        Args:
+            texts: Text or list of texts to encode
+            batch_size: Number of texts per forward pass
+            **encode_kwargs: Extra arguments for in-process ``model.encode`` calls
+
+        Returns:
+            Numpy array of embeddings aligned with ``texts``
+        """
+        if self.num_workers <= 1 or isinstance(texts, str) or len(texts) < self.min_parallel_texts:
+            return self.model.encode(texts, batch_size=batch_size, **encode_kwargs)
+
+        texts = list(texts)
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        sorted_texts = [texts[i] for i in order]
+
+        if self._pool is None:
+            self._pool = self.model.start_multi_process_pool(target_devices=['cpu'] * self.num_workers)
+        try:
+            sorted_embeddings = self.model.encode_multi_process(
+                sorted_texts,
+                self._pool,
+                batch_size=batch_size,
+                chunk_size=batch_size * self.batches_per_chunk
+            )
+        finally:
+            # Workers are only kept between calls inside a ``with`` block
+            if not self._keep_pool:
+                self.close()
+
+        # Restore input order
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+        return embeddings
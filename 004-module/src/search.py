@@ -3,20 +3,32 @@ Miami Hotel Search Engine - Search Module
 """
 import pandas as pd
 from typing import List, Dict, Any
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+from embedding_cache import get_embedding_cache
+from query_cache import get_query_cache
+from scoring import DotProductScorer, top_k_indices
+from encoders import get_encoder, get_default_backend, get_model_key
+from parallel_encoder import ParallelEncoder
+from documents import DocumentBuilder, HOTEL_FIELDS
 
 class HotelSearchEngine:
-    def __init__(self, data_path: str = "../data/miami_hotels.csv"):
+    def __init__(self, data_path: str = "../data/miami_hotels.csv", encode_workers: int = 1,
+                 encoder_backend: str = None):
         """Initialize the search engine with hotel data.
         
         Args:
             data_path: Path to the CSV file containing hotel data
+            encode_workers: Number of worker processes used to embed hotels (1 encodes in-process)
+            encoder_backend: Encoder inference backend ('torch', 'onnx' or 'onnx-int8'); defaults to EMBEDDING_BACKEND
         """
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.model_name = 'all-MiniLM-L6-v2'
+        self.encoder_backend = encoder_backend or get_default_backend()
+        self.model = get_encoder(self.model_name, self.encoder_backend)
+        self.model_key = get_model_key(self.model_name, self.encoder_backend)
+        self.encoder = ParallelEncoder(self.model, num_workers=encode_workers)
+        self.document_builder = DocumentBuilder(HOTEL_FIELDS)
         self.hotels_df = self._load_data(data_path)
         self.embeddings = None
+        self.scorer = None
         if not self.hotels_df.empty:
             self._compute_embeddings()
 
@@ -33,44 +45,14 @@ class HotelSearchEngine:
             print(f"Error loading data: {str(e)}")
             return pd.DataFrame()
 
-    def _get_text_for_embedding(self, row):
-        """Combine available text fields for embedding."""
-        text_parts = []
-        
-        # Add name and type
-        text_parts.append(str(row['name']))
-        text_parts.append(str(row['type']))
-        
-        # Add category if available
-        if pd.notna(row['category']):
-            text_parts.append(str(row['category']))
-        
-        # Add amenities
-        if pd.notna(row['amenities']):
-            text_parts.append(str(row['amenities']))
-        
-        # Add review and title
-        if pd.notna(row['review']):
-            text_parts.append(str(row['review']))
-        if pd.notna(row['title']):
-            text_parts.append(str(row['title']))
-        
-        # Add location info
-        if pd.notna(row['address']):
-            text_parts.append(str(row['address']))
-        
-        # Add awards info
-        if pd.notna(row['awards']):
-            text_parts.append(str(row['awards']))
-        
-        # Filter out 'nan' strings and join
-        text_parts = [part for part in text_parts if part.lower() != 'nan']
-        return " ".join(text_parts)
-
     def _compute_embeddings(self):
         """Compute embeddings for all hotel descriptions."""
-        descriptions = self.hotels_df.apply(self._get_text_for_embedding, axis=1).tolist()
-        self.embeddings = self.model.encode(descriptions)
+        descriptions = self.document_builder.build(self.hotels_df).tolist()
+        embeddings = get_embedding_cache().encode(self.encoder, descriptions, self.model_key)
+        
+        # Normalize once so queries are scored with a single dot product
+        self.scorer = DotProductScorer(embeddings)
+        self.embeddings = self.scorer.embeddings
 
     def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """Search for hotels based on the query.
@@ -85,14 +67,14 @@ class HotelSearchEngine:
         if self.hotels_df.empty or self.embeddings is None:
             return []
 
-        # Encode the query
-        query_embedding = self.model.encode([query])
+        # Encode the query (repeats are served from the query cache)
+        query_embedding = get_query_cache().encode(self.model, query, self.model_key)
         
         # Calculate similarities
-        similarities = cosine_similarity(query_embedding, self.embeddings)[0]
+        similarities = self.scorer.score(query_embedding)
         
         # Get top_k indices
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
+        top_indices = top_k_indices(similarities, top_k)
         
         # Return results with scores
         results = []
@@ -2,10 +2,7 @@
 Miami Hotel Search Engine - Search Module
 """
 import pandas as pd
-from typing import List, Dict, Any, Tuple
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+from typing import List, Dict, Any, Iterator, Tuple
 import re
 from dataclasses import dataclass
 from tqdm import tqdm
@@ -16,7 +13,17 @@ import os
 import json
 import requests
 from datetime import datetime
+import time
 import uuid
+from .utils.embedding_cache import get_embedding_cache
+from .utils.query_cache import get_query_cache
+from .utils.encoders import get_encoder, get_default_backend, get_model_key
+from .utils.documents import DocumentBuilder, HOTEL_FIELDS
+from .utils.fingerprint import text_hashes
+
+# Fields identifying a hotel row: name and address identify the hotel, and the
+# review title tells apart its rows (the data has one row per review)
+HOTEL_KEY_FIELDS = ['name', 'address', 'title']
 
 @dataclass
 class TextChunk:
@@ -71,86 +78,127 @@ class OpenRouterClient:
             return ""
 
 class TextChunker:
-    """Handles text chunking with overlap and metadata preservation."""
+    """Splits text into token windows that fit the embedding model.
+    
+    Chunk sizes are measured with the model's own tokenizer, so no chunk is
+    longer than the model's maximum sequence length and nothing is silently
+    truncated. Consecutive chunks overlap by a number of tokens, and chunk
+    boundaries never split a word.
+    """
     
-    def __init__(self, chunk_size: int = 512, overlap: float = 0.2):
+    def __init__(self, tokenizer=None, max_tokens: int = 254, overlap_tokens: int = 32):
         """Initialize chunker with size and overlap parameters.
         
         Args:
-            chunk_size: Maximum number of tokens per chunk
-            overlap: Fraction of overlap between chunks (0-1)
+            tokenizer: Hugging Face fast tokenizer of the embedding model. If None,
+                whitespace-separated words are counted as tokens.
+            max_tokens: Maximum number of tokens per chunk, excluding special tokens
+            overlap_tokens: Number of tokens shared by consecutive chunks
+        """
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be at least 0 and smaller than max_tokens")
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+    
+    @classmethod
+    def for_model(cls, model, overlap_tokens: int = 32) -> 'TextChunker':
+        """Create a chunker sized to a SentenceTransformer's maximum sequence length.
+        
+        Args:
+            model: SentenceTransformer whose tokenizer and max_seq_length are used
+            overlap_tokens: Number of tokens shared by consecutive chunks
         """
-        self.chunk_size = chunk_size
-        self.overlap = overlap
-        
-    def _split_into_sentences(self, text: str) -> List[str]:
-        """Split text into sentences using regex."""
-        # Simple sentence splitting - can be improved with NLP libraries
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        tokenizer = model.tokenizer
+        max_tokens = model.max_seq_length - tokenizer.num_special_tokens_to_add(pair=False)
+        return cls(tokenizer, max_tokens=max_tokens, overlap_tokens=min(overlap_tokens, max_tokens // 2))
+    
+    def _tokenize(self, text: str) -> Tuple[List[Tuple[int, int]], List[Any]]:
+        """Tokenize text once, returning character offsets and word IDs per token."""
+        if self.tokenizer is None:
+            offsets = [match.span() for match in re.finditer(r'\S+', text)]
+            return offsets, list(range(len(offsets)))
+        
+        encoding = self.tokenizer(
+            text,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            truncation=False,
+            verbose=False
+        )
+        return encoding['offset_mapping'], encoding.word_ids()
     
-    def chunk_text(self, text: str, doc_id: str, metadata: Dict[str, Any]) -> List[TextChunk]:
+    @staticmethod
+    def _word_start(word_ids: List[Any], i: int) -> int:
+        """Move a token position back to the first token of its word."""
+        while 0 < i < len(word_ids) and word_ids[i] is not None and word_ids[i] == word_ids[i - 1]:
+            i -= 1
+        return i
+    
+    def chunk_text(self, text: str, doc_id: str, metadata: Dict[str, Any]) -> Iterator[TextChunk]:
         """Split text into overlapping chunks with metadata.
         
+        The text is tokenized once and chunks are yielded lazily, so the
+        whole pass is linear in the text length.
+        
         Args:
             text: Input text to chunk
             doc_id: Unique identifier for the document
             metadata: Additional metadata to store with chunks
             
-        Returns:
-            List of TextChunk objects
+        Yields:
+            TextChunk objects
         """
-        sentences = self._split_into_sentences(text)
-        chunks = []
-        current_chunk = []
-        current_size = 0
+        offsets, word_ids = self._tokenize(text)
+        num_tokens = len(offsets)
+        start = 0
         chunk_id = 0
         
-        for sentence in sentences:
-            # Rough token count (words + punctuation)
-            sentence_size = len(sentence.split())
+        while start < num_tokens:
+            end = min(start + self.max_tokens, num_tokens)
             
-            if current_size + sentence_size > self.chunk_size and current_chunk:
-                # Save current chunk
-                chunk_text = " ".join(current_chunk)
-                chunks.append(TextChunk(
-                    text=chunk_text,
-                    doc_id=doc_id,
-                    chunk_id=chunk_id,
-                    metadata=metadata
-                ))
-                
-                # Start new chunk with overlap
-                overlap_size = int(self.chunk_size * self.overlap)
-                current_chunk = current_chunk[-overlap_size:] if overlap_size > 0 else []
-                current_size = sum(len(s.split()) for s in current_chunk)
-                chunk_id += 1
+            # Don't split a word across chunks
+            if end < num_tokens:
+                word_end = self._word_start(word_ids, end)
+                if word_end > start:
+                    end = word_end
             
-            current_chunk.append(sentence)
-            current_size += sentence_size
-        
-        # Add final chunk if any
-        if current_chunk:
-            chunk_text = " ".join(current_chunk)
-            chunks.append(TextChunk(
-                text=chunk_text,
+            yield TextChunk(
+                text=text[offsets[start][0]:offsets[end - 1][1]],
                 doc_id=doc_id,
                 chunk_id=chunk_id,
                 metadata=metadata
-            ))
-        
-        return chunks
+            )
+            if end == num_tokens:
+                break
+            
+            # Start the next chunk overlap_tokens before the end, on a word boundary
+            next_start = self._word_start(word_ids, max(end - self.overlap_tokens, start + 1))
+            start = next_start if next_start > start else end
+            chunk_id += 1
 
 class HotelSearchEngine:
-    def __init__(self, data_path: str = "../data/miami_hotels.csv", openrouter_api_key: str = None):
+    def __init__(self, data_path: str = "../data/miami_hotels.csv", openrouter_api_key: str = None,
+                 encode_batch_size: int = 64, upsert_batch_size: int = 256,
+                 encoder_backend: str = None):
         """Initialize the search engine with hotel data.
         
         Args:
             data_path: Path to the CSV file containing hotel data
             openrouter_api_key: OpenRouter API key for LLM features
+            encode_batch_size: Number of chunks passed to the model per forward pass
+            upsert_batch_size: Number of points written to Qdrant per upsert call
+            encoder_backend: Encoder inference backend ('torch', 'onnx' or 'onnx-int8'); defaults to EMBEDDING_BACKEND
         """
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.chunker = TextChunker(chunk_size=512, overlap=0.2)
+        self.model_name = 'all-MiniLM-L6-v2'
+        self.encoder_backend = encoder_backend or get_default_backend()
+        self.model = get_encoder(self.model_name, self.encoder_backend)
+        self.model_key = get_model_key(self.model_name, self.encoder_backend)
+        self.chunker = TextChunker.for_model(self.model, overlap_tokens=32)
+        self.document_builder = DocumentBuilder(HOTEL_FIELDS)
+        self.encode_batch_size = encode_batch_size
+        self.upsert_batch_size = upsert_batch_size
+        self.indexed_docs = {}  # Document ID -> (text hash, number of chunks) of hotel rows in Qdrant
         self.hotels_df = self._load_data(data_path)
         
         # Initialize Qdrant client
@@ -206,95 +254,160 @@ class HotelSearchEngine:
             print(f"Error loading data: {str(e)}")
             return pd.DataFrame()
 
-    def _get_text_for_embedding(self, row) -> str:
-        """Combine available text fields for embedding."""
-        text_parts = []
-        
-        # Add name and type
-        text_parts.append(str(row['name']))
-        text_parts.append(str(row['type']))
-        
-        # Add category if available
-        if pd.notna(row['category']):
-            text_parts.append(str(row['category']))
-        
-        # Add amenities
-        if pd.notna(row['amenities']):
-            text_parts.append(str(row['amenities']))
-        
-        # Add review and title
-        if pd.notna(row['review']):
-            text_parts.append(str(row['review']))
-        if pd.notna(row['title']):
-            text_parts.append(str(row['title']))
-        
-        # Add location info
-        if pd.notna(row['address']):
-            text_parts.append(str(row['address']))
-        
-        # Add awards info
-        if pd.notna(row['awards']):
-            text_parts.append(str(row['awards']))
-        
-        # Filter out 'nan' strings and join
-        text_parts = [part for part in text_parts if part.lower() != 'nan']
-        return " ".join(text_parts)
+    def _get_metadata(self, row) -> Dict[str, Any]:
+        """Build the Qdrant payload metadata for a hotel row."""
+        return {
+            'name': row['name'],
+            'type': row['type'],
+            'rating': row['rating'],
+            'hotel_class': row['hotelClass'],
+            'price_level': row['priceLevel'],
+            'price_range': row['priceRange'],
+            'address': row['address'],
+            'amenities': row['amenities'],
+            'review': row['review'],
+            'number_of_reviews': row['numberOfReviews'],
+            'ranking': row['rankingString'],
+            'phone': row['phone'],
+            'website': row['website']
+        }
 
-    def _prepare_and_index_chunks(self):
-        """Prepare text chunks and index them in Qdrant."""
-        print("Preparing text chunks and indexing in Qdrant...")
+    def _index_chunks(self, chunks: List[TextChunk]) -> int:
+        """Encode chunks in batches and upsert them into Qdrant in bulk.
         
-        # Process each hotel
-        for idx, row in tqdm(self.hotels_df.iterrows(), total=len(self.hotels_df)):
-            # Create metadata for the hotel
-            metadata = {
-                'name': row['name'],
-                'type': row['type'],
-                'rating': row['rating'],
-                'hotel_class': row['hotelClass'],
-                'price_level': row['priceLevel'],
-                'price_range': row['priceRange'],
-                'address': row['address'],
-                'amenities': row['amenities'],
-                'review': row['review'],
-                'number_of_reviews': row['numberOfReviews'],
-                'ranking': row['rankingString'],
-                'phone': row['phone'],
-                'website': row['website']
-            }
+        Args:
+            chunks: Chunks to embed and index
             
-            # Get text for embedding
-            text = self._get_text_for_embedding(row)
+        Returns:
+            Number of chunks indexed
+        """
+        for start in tqdm(range(0, len(chunks), self.upsert_batch_size)):
+            batch = chunks[start:start + self.upsert_batch_size]
             
-            # Create chunks
-            chunks = self.chunker.chunk_text(text, doc_id=str(idx), metadata=metadata)
+            # One batched forward pass over the chunks missing from the embedding cache
+            embeddings = get_embedding_cache().encode(
+                self.model,
+                [chunk.text for chunk in batch],
+                self.model_key,
+                batch_size=self.encode_batch_size,
+                show_progress_bar=False
+            )
             
-            # Compute embeddings and index in Qdrant
-            for chunk in chunks:
-                # Compute embedding
-                embedding = self.model.encode(chunk.text)
-                
+            points = []
+            for chunk, embedding in zip(batch, embeddings):
                 # Generate a UUID for the point ID
                 point_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{chunk.doc_id}_{chunk.chunk_id}"))
-                
-                # Add to Qdrant
-                self.qdrant_client.upsert(
+                points.append(models.PointStruct(
+                    id=point_id,
+                    vector=embedding.tolist(),
+                    payload={
+                        'text': chunk.text,
+                        'doc_id': chunk.doc_id,
+                        'chunk_id': chunk.chunk_id,
+                        **chunk.metadata
+                    }
+                ))
+            
+            # One upsert round-trip per batch
+            self.qdrant_client.upsert(
+                collection_name=self.collection_name,
+                points=points
+            )
+        
+        return len(chunks)
+
+    def _get_doc_ids(self, df: pd.DataFrame) -> List[str]:
+        """Derive document IDs from the identity of each hotel row.
+        
+        IDs depend only on ``HOTEL_KEY_FIELDS``, so an edited row keeps its
+        ID and its chunks are replaced instead of duplicated. Rows repeating
+        a key within ``df`` get the key's occurrence number appended.
+        
+        Args:
+            df: DataFrame slice with hotel rows
+            
+        Returns:
+            Document ID per row
+        """
+        keys = pd.Series('', index=df.index)
+        for field in HOTEL_KEY_FIELDS:
+            if field in df.columns:
+                keys = keys + '|' + df[field].fillna('').astype(str).str.strip().str.casefold()
+        occurrences = keys.groupby(keys).cumcount()
+        return [
+            str(uuid.uuid5(uuid.NAMESPACE_DNS, key if occurrence == 0 else f"{key}#{occurrence}"))
+            for key, occurrence in zip(keys, occurrences)
+        ]
+
+    def _chunk_changed_rows(self, df: pd.DataFrame) -> Tuple[List[TextChunk], Dict[str, Tuple[str, int]], List[Any]]:
+        """Chunk rows that are new or whose embedding text changed.
+        
+        Nothing is recorded as indexed here; callers do that once the chunks
+        are stored, so a failed write can be retried.
+        
+        Args:
+            df: DataFrame slice with hotel rows
+            
+        Returns:
+            Tuple of (chunks for the changed rows, (text hash, number of
+            chunks) by document ID of the changed rows, index labels of
+            unchanged rows)
+        """
+        chunks = []
+        changed = {}
+        skipped = []
+        texts = self.document_builder.build(df).tolist()
+        for (idx, row), text, text_hash, doc_id in zip(df.iterrows(), texts, text_hashes(texts), self._get_doc_ids(df)):
+            if self.indexed_docs.get(doc_id, (None,))[0] == text_hash:
+                skipped.append(idx)
+                continue
+            row_chunks = list(self.chunker.chunk_text(text, doc_id=doc_id, metadata=self._get_metadata(row)))
+            chunks.extend(row_chunks)
+            changed[doc_id] = (text_hash, len(row_chunks))
+        return chunks, changed, skipped
+
+    def _commit_changed_rows(self, changed: Dict[str, Tuple[str, int]]):
+        """Record indexed rows and delete chunks left over from their previous text.
+        
+        New chunks overwrite the old points with the same chunk number, so
+        only chunks past the new chunk count remain to be deleted.
+        
+        Args:
+            changed: (text hash, number of chunks) by document ID, as returned
+                by ``_chunk_changed_rows``
+        """
+        for doc_id, (text_hash, num_chunks) in changed.items():
+            previous = self.indexed_docs.get(doc_id)
+            if previous is not None and previous[1] > num_chunks:
+                self.qdrant_client.delete(
                     collection_name=self.collection_name,
-                    points=[
-                        models.PointStruct(
-                            id=point_id,
-                            vector=embedding.tolist(),
-                            payload={
-                                'text': chunk.text,
-                                'doc_id': chunk.doc_id,
-                                'chunk_id': chunk.chunk_id,
-                                **chunk.metadata
-                            }
-                        )
-                    ]
+                    points_selector=models.FilterSelector(filter=models.Filter(must=[
+                        models.FieldCondition(key='doc_id', match=models.MatchValue(value=doc_id)),
+                        models.FieldCondition(key='chunk_id', range=models.Range(gte=num_chunks))
+                    ]))
                 )
+            self.indexed_docs[doc_id] = (text_hash, num_chunks)
+
+    def _prepare_and_index_chunks(self):
+        """Prepare text chunks and index them in Qdrant.
+        
+        Chunks are collected across all hotels first so that encoding and
+        upserts run in batches instead of once per chunk.
+        """
+        print("Preparing text chunks and indexing in Qdrant...")
+        start_time = time.time()
+        
+        # Chunk every hotel
+        chunks, changed, _ = self._chunk_changed_rows(self.hotels_df)
+        
+        # Compute embeddings and index in Qdrant
+        num_chunks = self._index_chunks(chunks)
+        self._commit_changed_rows(changed)
         
-        print(f"Indexed chunks from {len(self.hotels_df)} hotels in Qdrant")
+        elapsed = time.time() - start_time
+        throughput = num_chunks / elapsed if elapsed > 0 else float('inf')
+        print(f"Indexed {num_chunks} chunks from {len(self.hotels_df)} hotels in Qdrant "
+              f"in {elapsed:.2f} seconds ({throughput:.1f} chunks/sec)")
 
     def _enhance_search_with_llm(self, query: str, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Enhance search results using LLM.
@@ -367,28 +480,15 @@ Please analyze these results and provide insights."""
         if self.hotels_df.empty:
             return []
 
-        # Encode the query
-        query_embedding = self.model.encode(query)
+        # Encode the query (repeats are served from the query cache)
+        query_embedding = get_query_cache().encode(self.model, query, self.model_key)
         
-        # Search in Qdrant
-        search_results = self.qdrant_client.search(
-            collection_name=self.collection_name,
-            query_vector=query_embedding.tolist(),
-            limit=top_k * 2  # Get more results to filter by hotel
-        )
-        
-        # Group results by hotel and get best chunk for each
-        hotel_scores = {}
-        for result in search_results:
-            doc_id = result.payload['doc_id']
-            score = result.score
-            
-            if doc_id not in hotel_scores or score > hotel_scores[doc_id][0]:
-                hotel_scores[doc_id] = (score, result.payload)
+        # Best-matching chunk of each of the top_k hotels
+        hotel_scores = self._search_hotels(query_embedding.tolist(), top_k)
         
         # Return results
         results = []
-        for doc_id, (score, payload) in sorted(hotel_scores.items(), key=lambda x: x[1][0], reverse=True):
+        for score, payload in hotel_scores:
             result = {k: v for k, v in payload.items() if k not in ['text', 'doc_id', 'chunk_id']}
             result['similarity_score'] = score
             results.append(result)
@@ -398,15 +498,69 @@ Please analyze these results and provide insights."""
         
         return results
 
-    def add_hotel(self, hotel_data: Dict[str, Any]):
+    def _search_hotels(self, query_vector: List[float], top_k: int) -> List[Tuple[float, Dict[str, Any]]]:
+        """Find the top_k hotels by their best-matching chunk.
+        
+        Uses Qdrant's group-by on ``doc_id`` (``query_points_groups``), so
+        the result holds ``top_k`` distinct hotels whenever the collection
+        has that many.
+        
+        Args:
+            query_vector: Query embedding
+            top_k: Number of hotels to return
+            
+        Returns:
+            (score, payload) pairs of the best chunk per hotel, best first
+        """
+        groups = self.qdrant_client.query_points_groups(
+            collection_name=self.collection_name,
+            query=query_vector,
+            group_by='doc_id',
+            limit=top_k,
+            group_size=1
+        ).groups
+        return [(group.hits[0].score, group.hits[0].payload) for group in groups if group.hits]
+
+    def add_hotel(self, hotel_data: Dict[str, Any]) -> int:
         """Add a new hotel to the search engine.
         
         Args:
             hotel_data: Dictionary containing hotel information
+            
+        Returns:
+            Number of hotels that were indexed (0 if it was already indexed unchanged)
+        """
+        return self.add_hotels([hotel_data])
+
+    def add_hotels(self, hotels: List[Dict[str, Any]]) -> int:
+        """Add or update hotels, chunking and embedding only new or changed rows.
+        
+        A hotel matching an indexed row on ``HOTEL_KEY_FIELDS`` replaces it:
+        its chunks are re-indexed if the embedding text changed, and re-adding
+        an unchanged hotel is a no-op. Rows are only recorded once their
+        chunks are stored, so a failed call can be retried.
+        
+        Args:
+            hotels: List of dictionaries containing hotel information
+            
+        Returns:
+            Number of hotels that were newly indexed or updated
         """
-        new_hotel_df = pd.DataFrame([hotel_data])
-        self.hotels_df = pd.concat([self.hotels_df, new_hotel_df], ignore_index=True)
-        self._prepare_and_index_chunks()  # Reprocess all chunks
+        # Partial hotel dicts get the missing columns as NaN, like rows read from the CSV
+        new_df = pd.DataFrame(hotels)
+        new_df = new_df.reindex(columns=self.hotels_df.columns.union(new_df.columns, sort=False))
+        chunks, changed, skipped = self._chunk_changed_rows(new_df)
+        if chunks:
+            self._index_chunks(chunks)
+        
+        # Updated hotels replace their previous rows
+        updated = {doc_id for doc_id in changed if doc_id in self.indexed_docs}
+        if updated and not self.hotels_df.empty:
+            keep = [doc_id not in updated for doc_id in self._get_doc_ids(self.hotels_df)]
+            self.hotels_df = self.hotels_df[keep]
+        self._commit_changed_rows(changed)
+        self.hotels_df = pd.concat([self.hotels_df, new_df.drop(index=skipped)], ignore_index=True)
+        return len(changed)
 
     def save_data(self, data_path: str):
         """Save the current hotel data to a CSV file.
@@ -2,171 +2,564 @@
 Generic search engine implementation using local embeddings.
 """
 import os
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import pandas as pd
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 from .base import HotelSearchEngine, HotelResult, SearchError
 from ..utils.logger import timeit, log_errors
-from ..utils.storage import save_embeddings, load_embeddings
+from ..utils.embedding_cache import get_embedding_cache
+from ..utils.query_cache import get_query_cache
+from ..utils.scoring import DotProductScorer, normalize_embeddings, top_k_indices
+from ..utils.ann_index import HNSWConfig, HNSWIndex, recall_report
+from ..utils.bm25 import BM25Index, reciprocal_rank_fusion
+from ..utils.filters import ColumnStore, HOTEL_FILTERS
+from ..utils.geo import GeoIndex
+from ..utils.reranker import RerankConfig, apply_rerank, get_reranker
+from ..utils.encoders import get_encoder, get_default_backend, get_model_key
+from ..utils.parallel_encoder import ParallelEncoder
+from ..utils.documents import DocumentBuilder, HOTEL_FIELDS
+from ..utils.pipeline import IngestionPipeline
+from ..utils.storage import save_embeddings, load_embeddings, append_embeddings, get_ann_index_path, get_bm25_index_path, load_manifest, save_manifest
+from ..utils.fingerprint import file_digest, text_hashes
 
 class GenericSearchEngine(HotelSearchEngine):
     """Generic search engine using local embeddings."""
     
-    def __init__(self, data_path: str = "../data/miami_hotels.csv"):
+    def __init__(self, data_path: str = "../data/miami_hotels.csv", encode_workers: int = 1,
+                 ingest_chunk_size: int = 1000,
+                 encoder_backend: str = None,
+                 ann_config: HNSWConfig = None,
+                 hybrid: bool = True,
+                 fusion_candidates: int = 50,
+                 rerank_config: RerankConfig = None):
         """Initialize the generic search engine.
         
         Args:
             data_path: Path to the CSV file containing hotel data
+            encode_workers: Number of worker processes used to embed documents (1 encodes in-process)
+            ingest_chunk_size: Number of CSV rows read, encoded and written per pipeline step
+            encoder_backend: Encoder inference backend ('torch', 'onnx' or 'onnx-int8'); defaults to EMBEDDING_BACKEND
+            ann_config: HNSW index parameters (requires hnswlib); None always searches exactly
+            hybrid: Fuse BM25 keyword matches with dense scores; False searches dense-only
+            fusion_candidates: Number of dense and lexical candidates fused per query
+            rerank_config: Cross-encoder re-ranking parameters; None skips re-ranking
         """
         try:
             # Initialize model
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.model_name = 'all-MiniLM-L6-v2'
+            self.encoder_backend = encoder_backend or get_default_backend()
+            self.model = get_encoder(self.model_name, self.encoder_backend)
+            self.model_key = get_model_key(self.model_name, self.encoder_backend)
+            self.encoder = ParallelEncoder(self.model, num_workers=encode_workers)
+            self.ingest_chunk_size = ingest_chunk_size
+            self.document_builder = DocumentBuilder(HOTEL_FIELDS)
             
-            # Try to load existing embeddings
-            loaded_data = load_embeddings('generic')
-            if loaded_data is not None:
-                self.embeddings, self.hotels_df = loaded_data
-                print("Loaded existing embeddings from storage")
-            else:
-                # Load and process data
-                self.hotels_df = self._load_data(data_path)
-                self.embeddings = self._compute_embeddings()
-                
-                # Save embeddings for future use
-                save_embeddings('generic', self.embeddings, self.hotels_df)
-                print("Computed and saved new embeddings")
+            # Stores are per dataset, so engines over different CSVs never share vectors
+            self.store_name = f"generic_{Path(data_path).stem}"
+            self._load_store(data_path)
+            
+            # Stored vectors are unit length, so the memory-mapped array is scored as is
+            self.scorer = DotProductScorer(self.embeddings, normalized=True)
+            self.embeddings = self.scorer.embeddings
+            
+            # Approximate index for large corpora, persisted next to the store
+            self.ann_config = ann_config
+            self.ann_index = None
+            self._sync_ann_index()
+            
+            # Lexical index fused with dense scores, persisted next to the store
+            self.fusion_candidates = fusion_candidates
+            self.bm25 = self._load_bm25_index() if hybrid else None
+            
+            # Filterable columns, parsed once so filters are array comparisons
+            self.filter_columns = ColumnStore(HOTEL_FILTERS)
+            self.filter_columns.add(self.hotels_df)
+            
+            # Spatial grid over hotel coordinates for radius and bounding-box pruning
+            self.geo_index = GeoIndex()
+            self._add_locations(self.hotels_df)
+            
+            # Optional cross-encoder pass over the leading candidates
+            self.rerank_config = rerank_config
+            self.reranker = get_reranker(rerank_config.model_name, rerank_config.max_length) if rerank_config else None
                 
         except Exception as e:
             raise SearchError(f"Failed to initialize search engine: {str(e)}")
     
-    def _load_data(self, data_path: str) -> pd.DataFrame:
-        """Load hotel data from CSV file.
+    def _load_store(self, data_path: str):
+        """Load the embedding store for the CSV, re-encoding only what changed.
+        
+        The store's manifest records the model, embedding dimension, text
+        schema, a digest of the CSV and a hash of each row's embedding text.
+        An unchanged CSV loads the store as is. After an edit, rows whose
+        text hash is stored reuse their vectors, new or changed rows are
+        encoded and deleted rows are dropped. A store built with another
+        model, or whose vectors don't match the recorded dimension, is
+        rejected and rebuilt. The model itself is only loaded when rows
+        have to be encoded.
         
         Args:
             data_path: Path to the CSV file
-            
-        Returns:
-            DataFrame containing hotel data
         """
+        manifest = load_manifest(self.store_name)
+        stored = load_embeddings(self.store_name) if manifest is not None else None
+        if stored is not None and (len(manifest['row_hashes']) != len(stored[0])
+                                   or manifest['dimension'] != stored[0].shape[1]):
+            stored = None
+        if stored is not None and manifest['model'] != self.model_key:
+            print(f"Rejecting stored embeddings built with {manifest['model']} ({manifest['dimension']} dimensions)")
+            stored = None
+        
+        if stored is None:
+            # Stream data through the embedding pipeline into storage
+            self._ingest_data(data_path)
+            self.embeddings, self.hotels_df = load_embeddings(self.store_name)
+            print("Computed and saved new embeddings")
+        elif manifest['source'] == file_digest(data_path) and manifest['schema'] == self.document_builder.fields:
+            self.embeddings, self.hotels_df = stored
+            self.source_digest, self.row_hashes = manifest['source'], manifest['row_hashes']
+            print("Loaded existing embeddings from storage")
+        else:
+            self._update_store(data_path, stored[0], manifest['row_hashes'])
+    
+    def _update_store(self, data_path: str, stored_embeddings: np.ndarray, stored_hashes: List[str]):
+        """Rewrite the store for an edited CSV, encoding only rows whose text isn't stored.
+        
+        Args:
+            data_path: Path to the CSV file
+            stored_embeddings: Embeddings of the current store
+            stored_hashes: Text hashes aligned with ``stored_embeddings``
+        """
+        df = pd.read_csv(data_path)
+        hashes = text_hashes(self.document_builder.build(df))
+        
+        # Match rows by content, so inserted, deleted and reordered rows keep their vectors
+        positions = {}
+        for position, row_hash in enumerate(stored_hashes):
+            positions.setdefault(row_hash, position)
+        sources = np.array([positions.get(row_hash, -1) for row_hash in hashes], dtype=np.int64)
+        kept = sources >= 0
+        changed = np.flatnonzero(~kept)
+        
+        embeddings = np.empty((len(df), stored_embeddings.shape[1]), dtype=np.float32)
+        embeddings[kept] = stored_embeddings[sources[kept]]
+        if len(changed):
+            embeddings[changed] = normalize_embeddings(self._compute_embeddings(df.iloc[changed]))
+        
+        save_embeddings(self.store_name, embeddings, df)
+        self.embeddings, self.hotels_df = embeddings, df
+        self.source_digest, self.row_hashes = file_digest(data_path), hashes
+        self._save_manifest(embeddings.shape[1])
+        print(f"Re-encoded {len(changed)} new or changed rows of {len(df)}, "
+              f"dropped {len(stored_hashes) - len(np.unique(sources[kept]))} stored rows")
+    
+    def _save_manifest(self, dimension: int):
+        """Record the model, dimension, text schema, CSV digest and row hashes of the store.
+        
+        Args:
+            dimension: Embedding dimension of the stored vectors
+        """
+        save_manifest(self.store_name, {
+            'model': self.model_key,
+            'dimension': int(dimension),
+            'schema': self.document_builder.fields,
+            'source': self.source_digest,
+            'row_hashes': self.row_hashes
+        })
+    
+    def _ingest_data(self, data_path: str):
+        """Stream hotel data from CSV into the embedding store.
+        
+        The CSV is read in chunks and each chunk's text building, encoding
+        and write run as pipelined stages, so memory use during ingestion
+        doesn't grow with the file size.
+        
+        Args:
+            data_path: Path to the CSV file
+        """
+        num_written = 0
+        dimension = None
+        hashes = []
+        
+        def write(df: pd.DataFrame, embeddings: np.ndarray):
+            nonlocal num_written, dimension
+            dimension = embeddings.shape[1]
+            embeddings = normalize_embeddings(embeddings)
+            if num_written == 0:
+                save_embeddings(self.store_name, embeddings, df)
+            elif not append_embeddings(self.store_name, embeddings, df):
+                stored_embeddings, stored_df = load_embeddings(self.store_name)
+                save_embeddings(
+                    self.store_name,
+                    np.vstack([stored_embeddings, embeddings]),
+                    pd.concat([stored_df, df], ignore_index=True)
+                )
+            hashes.extend(text_hashes(self.document_builder.build(df)))
+            num_written += len(df)
+        
         try:
-            return pd.read_csv(data_path)
+            pipeline = IngestionPipeline(
+                build_text=lambda df: self.document_builder.build(df).tolist(),
+                encode=lambda texts: get_embedding_cache().encode(self.encoder, texts, self.model_key),
+                write=write,
+                chunk_size=self.ingest_chunk_size
+            )
+            with self.encoder:
+                pipeline.run(data_path)
+            
+            # A header-only CSV still gets an (empty) store
+            if num_written == 0:
+                dimension = self.model.get_sentence_embedding_dimension()
+                save_embeddings(
+                    self.store_name,
+                    np.zeros((0, dimension), dtype=np.float32),
+                    pd.read_csv(data_path, nrows=0)
+                )
+            
+            # Written last, so an interrupted ingest leaves no manifest and is redone
+            self.source_digest, self.row_hashes = file_digest(data_path), hashes
+            self._save_manifest(dimension)
         except Exception as e:
             raise SearchError(f"Failed to load data: {str(e)}")
     
-    def _compute_embeddings(self) -> np.ndarray:
+    def _compute_embeddings(self, df: pd.DataFrame = None) -> np.ndarray:
         """Compute embeddings for all hotels.
         
+        Args:
+            df: Rows to embed; defaults to all loaded hotels
+        
         Returns:
             Numpy array of embeddings
         """
         try:
+            if df is None:
+                df = self.hotels_df
+            
             # Combine text fields for embedding
-            texts = []
-            for _, row in self.hotels_df.iterrows():
-                text = self._get_text_for_embedding(row)
-                texts.append(text)
+            texts = self.document_builder.build(df).tolist()
             
-            # Compute embeddings
-            return self.model.encode(texts)
+            # Compute embeddings, reusing cached vectors for unchanged text
+            return get_embedding_cache().encode(self.encoder, texts, self.model_key)
         except Exception as e:
             raise SearchError(f"Failed to compute embeddings: {str(e)}")
     
-    def _get_text_for_embedding(self, row: pd.Series) -> str:
-        """Combine available text fields for embedding.
+    @timeit
+    @log_errors
+    def search(self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None,
+               near: Optional[Tuple[float, float, float]] = None,
+               bbox: Optional[Tuple[float, float, float, float]] = None) -> List[HotelResult]:
+        """Search for hotels using cosine similarity fused with BM25.
+        
+        Dense and lexical candidates are combined with reciprocal rank
+        fusion, so result scores are fused rank scores when the engine is
+        hybrid. Short queries made of rare indexed terms are answered by the
+        inverted index alone, without encoding the query. With
+        ``rerank_config``, the leading candidates are re-scored by a
+        cross-encoder and carry its scores.
         
         Args:
-            row: DataFrame row containing hotel data
+            query: Search query string
+            top_k: Number of results to return
+            filters: Optional conditions on ``HOTEL_FILTERS`` fields, e.g.
+                ``{'priceLevel': {'lte': '$$'}, 'rating': {'gte': 4}}``;
+                only matching hotels are scored
+            near: Optional (latitude, longitude, radius in km); only hotels
+                within the radius are scored
+            bbox: Optional (min latitude, min longitude, max latitude, max
+                longitude); only hotels inside the box are scored
             
         Returns:
-            Combined text string
+            List of HotelResult objects
+            
+        Raises:
+            SearchError: If the search fails
         """
-        text_parts = []
-        
-        # Add name and type
-        text_parts.append(str(row['name']))
-        text_parts.append(str(row['type']))
-        
-        # Add category if available
-        if pd.notna(row['category']):
-            text_parts.append(str(row['category']))
-        
-        # Add amenities
-        if pd.notna(row['amenities']):
-            text_parts.append(str(row['amenities']))
-        
-        # Add review and title
-        if pd.notna(row['review']):
-            text_parts.append(str(row['review']))
-        if pd.notna(row['title']):
-            text_parts.append(str(row['title']))
-        
-        # Add location info
-        if pd.notna(row['address']):
-            text_parts.append(str(row['address']))
-        
-        # Add awards info
-        if pd.notna(row['awards']):
-            text_parts.append(str(row['awards']))
-        
-        # Filter out 'nan' strings and join
-        text_parts = [part for part in text_parts if part.lower() != 'nan']
-        return " ".join(text_parts)
-    
+        try:
+            mask = self._filter_mask(filters, near, bbox)
+            if mask is not None and not mask.any():
+                return []
+            
+            # Obvious keyword queries are answered by the inverted index alone
+            num_ranked = self._num_ranked(top_k)
+            lexical_indices, lexical_only = self._lexical_candidates(query, top_k, mask)
+            if lexical_only:
+                ranked = reciprocal_rank_fusion([lexical_indices])[:num_ranked]
+            else:
+                # Encode query (repeats are served from the query cache)
+                query_embedding = get_query_cache().encode(self.model, query, self.model_key)
+                
+                # Nearest rows, fused with the lexical hits
+                dense_indices, dense_scores = self._dense_candidates(query_embedding[np.newaxis], self._num_candidates(num_ranked), mask)
+                ranked = self._fuse(dense_indices[0], dense_scores[0], lexical_indices, num_ranked)
+            
+            # Create results
+            ranked = self._rerank([query], [ranked])[0][:top_k]
+            return [self._make_result(idx, score) for idx, score in ranked]
+            
+        except Exception as e:
+            raise SearchError(f"Search failed: {str(e)}")
+
     @timeit
     @log_errors
-    def search(self, query: str, top_k: int = 5) -> List[HotelResult]:
-        """Search for hotels using cosine similarity.
+    def search_batch(self, queries: List[str], top_k: int = 5, batch_size: int = 256,
+                     filters: Optional[Dict[str, Any]] = None,
+                     near: Optional[Tuple[float, float, float]] = None,
+                     bbox: Optional[Tuple[float, float, float, float]] = None) -> List[List[HotelResult]]:
+        """Search for many queries at once.
+        
+        Keyword queries are answered by the inverted index as in ``search``.
+        The remaining queries are encoded in one batch and scored against
+        the corpus with one matrix multiply per ``batch_size`` queries;
+        top-k selection runs on the whole score matrix at once. Re-ranking
+        runs one cross-encoder pass over the candidates of all queries.
         
         Args:
-            query: Search query string
-            top_k: Number of results to return
+            queries: Search query strings
+            top_k: Number of results to return per query
+            batch_size: Number of queries scored per matrix multiply
+            filters: Optional conditions applied to every query, as in ``search``
+            near: Optional radius condition applied to every query, as in ``search``
+            bbox: Optional bounding box applied to every query, as in ``search``
             
         Returns:
-            List of HotelResult objects
+            One list of HotelResult objects per query, in query order
             
         Raises:
             SearchError: If the search fails
         """
         try:
-            # Encode query
-            query_embedding = self.model.encode(query)
+            queries = list(queries)
+            mask = self._filter_mask(filters, near, bbox)
+            if mask is not None and not mask.any():
+                return [[] for _ in queries]
             
-            # Compute similarities
-            similarities = cosine_similarity([query_embedding], self.embeddings)[0]
+            num_ranked = self._num_ranked(top_k)
+            lexical = [self._lexical_candidates(query, top_k, mask) for query in queries]
+            rankings = [
+                reciprocal_rank_fusion([indices])[:num_ranked] if lexical_only else None
+                for indices, lexical_only in lexical
+            ]
             
-            # Get top k results
-            top_indices = np.argsort(similarities)[-top_k:][::-1]
+            # Only queries the inverted index couldn't answer are encoded
+            pending = [i for i, ranked in enumerate(rankings) if ranked is None]
+            if pending:
+                query_embeddings = get_query_cache().encode_many(self.model, [queries[i] for i in pending], self.model_key)
             
-            # Create results
-            results = []
-            for idx in top_indices:
-                row = self.hotels_df.iloc[idx]
-                results.append(HotelResult(
-                    title=row['name'],
-                    url=row['website'] if pd.notna(row['website']) else '',
-                    snippet=row['review'] if pd.notna(row['review']) else '',
-                    score=float(similarities[idx]),
-                    source='generic',
-                    metadata={
-                        'type': row['type'],
-                        'rating': row['rating'] if pd.notna(row['rating']) else None,
-                        'hotel_class': row['hotelClass'] if pd.notna(row['hotelClass']) else None,
-                        'price_level': row['priceLevel'] if pd.notna(row['priceLevel']) else None,
-                        'price_range': row['priceRange'] if pd.notna(row['priceRange']) else None,
-                        'address': row['address'] if pd.notna(row['address']) else None,
-                        'amenities': row['amenities'] if pd.notna(row['amenities']) else None,
-                        'number_of_reviews': row['numberOfReviews'] if pd.notna(row['numberOfReviews']) else None,
-                        'ranking': row['rankingString'] if pd.notna(row['rankingString']) else None,
-                        'phone': row['phone'] if pd.notna(row['phone']) else None
-                    }
-                ))
-            
-            return results
+            for start in range(0, len(pending), batch_size):
+                dense_indices, dense_scores = self._dense_candidates(
+                    query_embeddings[start:start + batch_size], self._num_candidates(num_ranked), mask
+                )
+                for i, row_indices, row_scores in zip(pending[start:start + batch_size], dense_indices, dense_scores):
+                    rankings[i] = self._fuse(row_indices, row_scores, lexical[i][0], num_ranked)
+            
+            return [
+                [self._make_result(idx, score) for idx, score in ranked[:top_k]]
+                for ranked in self._rerank(queries, rankings)
+            ]
             
         except Exception as e:
-            raise SearchError(f"Search failed: {str(e)}")
+            raise SearchError(f"Batch search failed: {str(e)}")
+
+    def _num_candidates(self, top_k: int) -> int:
+        """Number of dense candidates needed for ``top_k`` results."""
+        return top_k if self.bm25 is None else max(top_k, self.fusion_candidates)
+
+    def _num_ranked(self, top_k: int) -> int:
+        """Number of ranked candidates kept for ``top_k`` results, enough to feed the re-ranker."""
+        return top_k if self.reranker is None else max(top_k, self.rerank_config.candidates)
+
+    def _rerank(self, queries: List[str], rankings: List[List[Tuple[int, float]]]) -> List[List[Tuple[int, float]]]:
+        """Re-score the leading candidates of each ranking with the cross-encoder.
+        
+        Args:
+            queries: Search query strings
+            rankings: (row index, score) pairs per query, best first
+            
+        Returns:
+            Rankings with up to ``rerank_config.candidates`` leading entries
+            reordered by cross-encoder score; unchanged without a reranker
+        """
+        if self.reranker is None:
+            return rankings
+        documents = [
+            self.document_builder.build(self.hotels_df.iloc[[idx for idx, _ in ranked[:self.rerank_config.candidates]]]).tolist()
+            for ranked in rankings
+        ]
+        scores = self.reranker.rerank_many(queries, documents, self.rerank_config)
+        return [apply_rerank(ranked, query_scores) for ranked, query_scores in zip(rankings, scores)]
+
+    def _filter_mask(self, filters: Optional[Dict[str, Any]],
+                     near: Optional[Tuple[float, float, float]] = None,
+                     bbox: Optional[Tuple[float, float, float, float]] = None) -> Optional[np.ndarray]:
+        """Evaluate search filters and spatial conditions over the stored hotels.
+        
+        Args:
+            filters: Conditions on ``HOTEL_FILTERS`` fields, or None
+            near: Optional (latitude, longitude, radius in km)
+            bbox: Optional (min latitude, min longitude, max latitude, max longitude)
+            
+        Returns:
+            Boolean array over rows, or None when there are no conditions
+        """
+        if not filters and near is None and bbox is None:
+            return None
+        mask = self.geo_index.mask(near, bbox)
+        if filters:
+            mask &= self.filter_columns.mask(filters)
+        return mask
+
+    def _add_locations(self, df: pd.DataFrame):
+        """Add the coordinates of new rows to the spatial index."""
+        missing = pd.Series(np.nan, index=df.index)
+        self.geo_index.add(
+            pd.to_numeric(df['latitude'], errors='coerce') if 'latitude' in df.columns else missing,
+            pd.to_numeric(df['longitude'], errors='coerce') if 'longitude' in df.columns else missing
+        )
+
+    def _lexical_candidates(self, query: str, top_k: int,
+                            mask: Optional[np.ndarray] = None) -> Tuple[List[int], bool]:
+        """Get BM25 hits for a query.
+        
+        Args:
+            query: Search query string
+            top_k: Number of results the caller needs
+            mask: Optional boolean array of the rows allowed by the filters
+            
+        Returns:
+            Tuple of (row indices, whether the hits alone answer the query)
+        """
+        if self.bm25 is None:
+            return [], False
+        indices, _ = self.bm25.search(query, self._num_candidates(top_k), mask)
+        return indices, len(indices) >= top_k and self.bm25.is_keyword_query(query)
+
+    def _dense_candidates(self, query_embeddings: np.ndarray, top_k: int,
+                          mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the nearest rows for a block of query embeddings.
+        
+        Uses the HNSW index when there is one and an exact scan otherwise.
+        Filtered searches scan only the rows the filters allow, which is
+        exact and never returns fewer rows than asked for while any match.
+        
+        Args:
+            query_embeddings: Query embeddings of shape (num_queries, dim)
+            top_k: Number of rows per query
+            mask: Optional boolean array of the rows allowed by the filters
+            
+        Returns:
+            Tuple of (row indices, cosine similarities), best first
+        """
+        if mask is not None:
+            rows = np.flatnonzero(mask)
+            similarities = self.scorer.score_batch(query_embeddings, rows)
+            top_indices = top_k_indices(similarities, top_k)
+            return rows[top_indices], np.take_along_axis(similarities, top_indices, axis=1)
+        if self.ann_index is not None:
+            return self.ann_index.search(normalize_embeddings(query_embeddings), top_k)
+        similarities = self.scorer.score_batch(query_embeddings)
+        top_indices = top_k_indices(similarities, top_k)
+        return top_indices, np.take_along_axis(similarities, top_indices, axis=1)
+
+    def _fuse(self, dense_indices: np.ndarray, dense_scores: np.ndarray, lexical_indices: List[int],
+              top_k: int) -> List[Tuple[int, float]]:
+        """Combine dense and lexical candidates into the final ranking.
+        
+        Args:
+            dense_indices: Dense candidates, best first
+            dense_scores: Cosine similarities of the dense candidates
+            lexical_indices: BM25 candidates, best first
+            top_k: Number of results to keep
+            
+        Returns:
+            (row index, score) pairs; cosine scores for dense-only engines,
+            reciprocal rank fusion scores otherwise
+        """
+        if self.bm25 is None:
+            return list(zip(dense_indices, dense_scores))[:top_k]
+        return reciprocal_rank_fusion([dense_indices.tolist(), lexical_indices])[:top_k]
+
+    def _load_bm25_index(self) -> BM25Index:
+        """Load the persisted BM25 index, rebuilding it if it doesn't match the store.
+        
+        Returns:
+            BM25 index over the embedding text of every stored row
+        """
+        path = get_bm25_index_path(self.store_name)
+        index = BM25Index.load(path)
+        if index is None or len(index) != len(self.hotels_df):
+            index = BM25Index()
+            index.add(self.document_builder.build(self.hotels_df))
+            index.save(path)
+        return index
+
+    def _sync_ann_index(self):
+        """Open, build or extend the HNSW index so it covers every stored row.
+        
+        Corpora smaller than ``ann_config.min_size`` are searched exactly
+        and get no index.
+        """
+        if self.ann_config is None or len(self.embeddings) < self.ann_config.min_size:
+            self.ann_index = None
+        elif self.ann_index is None:
+            self.ann_index = HNSWIndex.open(get_ann_index_path(self.store_name), self.embeddings, self.ann_config)
+        elif self.ann_index.add(self.embeddings):
+            self.ann_index.save(get_ann_index_path(self.store_name))
+
+    def ann_recall_report(self, queries: List[str], top_k: int = 10,
+                          ef_values: Sequence[int] = (16, 32, 64, 128, 256)) -> List[Dict[str, float]]:
+        """Measure HNSW recall@k and latency against exact search.
+        
+        Uses the engine's index, or builds a temporary one from
+        ``ann_config`` (or default parameters) when the engine searches
+        exactly, so parameters can be compared before enabling the index.
+        
+        Args:
+            queries: Evaluation query strings
+            top_k: Number of results compared per query
+            ef_values: Search-time ``ef`` values to evaluate
+            
+        Returns:
+            One dictionary per ``ef`` with ``recall_at_k`` and per-query
+            milliseconds for ANN and exact search
+        """
+        try:
+            query_embeddings = get_query_cache().encode_many(self.model, list(queries), self.model_key)
+            index = self.ann_index or HNSWIndex.build(self.embeddings, self.ann_config or HNSWConfig())
+            return recall_report(index, self.scorer, query_embeddings, top_k, ef_values)
+        except Exception as e:
+            raise SearchError(f"Recall report failed: {str(e)}")
+
+    def _make_result(self, idx: int, score: float) -> HotelResult:
+        """Build the result for a hotel row.
+        
+        Args:
+            idx: Position of the hotel in ``self.hotels_df``
+            score: Similarity score
+            
+        Returns:
+            HotelResult for the row
+        """
+        row = self.hotels_df.iloc[idx]
+        return HotelResult(
+            title=row['name'],
+            url=row['website'] if pd.notna(row['website']) else '',
+            snippet=row['review'] if pd.notna(row['review']) else '',
+            score=float(score),
+            source='generic',
+            metadata={
+                'type': row['type'],
+                'rating': row['rating'] if pd.notna(row['rating']) else None,
+                'hotel_class': row['hotelClass'] if pd.notna(row['hotelClass']) else None,
+                'price_level': row['priceLevel'] if pd.notna(row['priceLevel']) else None,
+                'price_range': row['priceRange'] if pd.notna(row['priceRange']) else None,
+                'address': row['address'] if pd.notna(row['address']) else None,
+                'amenities': row['amenities'] if pd.notna(row['amenities']) else None,
+                'number_of_reviews': row['numberOfReviews'] if pd.notna(row['numberOfReviews']) else None,
+                'ranking': row['rankingString'] if pd.notna(row['rankingString']) else None,
+                'phone': row['phone'] if pd.notna(row['phone']) else None
+            }
+        )
 
     def add_hotel(self, hotel_data: Dict[str, Any]):
         """Add a new hotel to the search engine.
@@ -174,10 +567,37 @@ class GenericSearchEngine(HotelSearchEngine):
         Args:
             hotel_data: Dictionary containing hotel information
         """
+        self.add_hotels([hotel_data])
+
+    def add_hotels(self, hotels: List[Dict[str, Any]]):
+        """Add new hotels, embedding only the appended rows.
+        
+        The new embeddings are stacked onto ``self.embeddings`` and appended
+        to the on-disk store without rewriting it.
+        
+        Args:
+            hotels: List of dictionaries containing hotel information
+        """
         try:
-            new_hotel_df = pd.DataFrame([hotel_data])
-            self.hotels_df = pd.concat([self.hotels_df, new_hotel_df], ignore_index=True)
-            self._compute_embeddings()  # Recompute embeddings
+            num_existing = len(self.hotels_df)
+            combined_df = pd.concat([self.hotels_df, pd.DataFrame(hotels)], ignore_index=True)
+            new_rows = combined_df.iloc[num_existing:]
+            new_embeddings = self._compute_embeddings(new_rows)
+            
+            self.hotels_df = combined_df
+            self.scorer.add(new_embeddings)
+            self.embeddings = self.scorer.embeddings
+            
+            if not append_embeddings(self.store_name, self.embeddings[num_existing:], new_rows):
+                save_embeddings(self.store_name, self.embeddings, self.hotels_df)
+            self.row_hashes = self.row_hashes + text_hashes(self.document_builder.build(new_rows))
+            self._save_manifest(self.embeddings.shape[1])
+            self._sync_ann_index()
+            self.filter_columns.add(new_rows)
+            self._add_locations(new_rows)
+            if self.bm25 is not None:
+                self.bm25.add(self.document_builder.build(new_rows))
+                self.bm25.save(get_bm25_index_path(self.store_name))
         except Exception as e:
             raise SearchError(f"Error adding hotel: {str(e)}")
 
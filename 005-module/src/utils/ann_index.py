@@ -0,0 +1,180 @@
+"""
+Approximate nearest-neighbor (HNSW) index over stored embeddings.
+"""
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from .scoring import DotProductScorer, normalize_embeddings, top_k_indices
+
+@dataclass
+class HNSWConfig:
+    """Build and search parameters for an HNSW index."""
+    M: int = 16  # Graph out-degree; higher improves recall at the cost of memory and build time
+    ef_construction: int = 200  # Candidate list size while building
+    ef: int = 64  # Candidate list size while searching; the main recall/latency knob
+    min_size: int = 10_000  # Corpora smaller than this are searched exactly
+    num_threads: int = -1  # Threads used for building and batch queries (-1: all cores)
+
+def _import_hnswlib():
+    """Import the optional ``hnswlib`` dependency."""
+    try:
+        import hnswlib
+    except ImportError as e:
+        raise ImportError("HNSW indexing requires the optional 'hnswlib' package (pip install hnswlib)") from e
+    return hnswlib
+
+class HNSWIndex:
+    """HNSW graph over L2-normalized embeddings, scored by inner product.
+
+    Labels are row positions in the embedding matrix, so rows appended to
+    the store are added to the graph by position.
+    """
+
+    def __init__(self, dim: int, config: HNSWConfig):
+        """Initialize an empty index handle.
+
+        Args:
+            dim: Embedding dimension
+            config: Build and search parameters
+        """
+        self.config = config
+        self.index = _import_hnswlib().Index(space='ip', dim=dim)
+
+    @classmethod
+    def open(cls, path: Path, embeddings: np.ndarray, config: HNSWConfig) -> 'HNSWIndex':
+        """Load the index persisted at ``path`` or build a new one.
+
+        A persisted index is reused if it was built with the same ``M`` and
+        ``ef_construction`` and covers no more rows than ``embeddings``;
+        rows it doesn't cover yet are added. Otherwise the index is rebuilt.
+        The index is saved back to ``path`` whenever it changed.
+
+        Args:
+            path: Location of the persisted index
+            embeddings: L2-normalized embeddings the index must cover
+            config: Build and search parameters
+
+        Returns:
+            Index covering every row of ``embeddings``
+        """
+        index = None
+        if path.exists():
+            index = cls(embeddings.shape[1], config)
+            try:
+                index.index.load_index(str(path), max_elements=len(embeddings))
+                if (index.index.M != config.M
+                        or index.index.ef_construction != config.ef_construction
+                        or index.index.element_count > len(embeddings)):
+                    index = None
+            except RuntimeError:
+                index = None
+
+        if index is None:
+            index = cls.build(embeddings, config)
+            index.save(path)
+        elif index.add(embeddings):
+            index.save(path)
+
+        index.index.set_ef(config.ef)
+        return index
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, config: HNSWConfig) -> 'HNSWIndex':
+        """Build an in-memory index.
+
+        Args:
+            embeddings: L2-normalized embeddings to index
+            config: Build and search parameters
+
+        Returns:
+            Index covering every row of ``embeddings``
+        """
+        index = cls(embeddings.shape[1], config)
+        index.index.init_index(max_elements=max(len(embeddings), 1), ef_construction=config.ef_construction, M=config.M)
+        index.add(embeddings)
+        index.index.set_ef(config.ef)
+        return index
+
+    def __len__(self) -> int:
+        return self.index.element_count
+
+    def add(self, embeddings: np.ndarray) -> bool:
+        """Add the rows of ``embeddings`` that aren't in the index yet.
+
+        Args:
+            embeddings: Full L2-normalized embedding matrix
+
+        Returns:
+            True if any rows were added
+        """
+        start = len(self)
+        if start >= len(embeddings):
+            return False
+        if len(embeddings) > self.index.get_max_elements():
+            self.index.resize_index(len(embeddings))
+        self.index.add_items(embeddings[start:], np.arange(start, len(embeddings)), num_threads=self.config.num_threads)
+        return True
+
+    def save(self, path: Path):
+        """Persist the index to ``path``."""
+        self.index.save_index(str(path))
+
+    def search(self, queries: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Find approximate nearest neighbors.
+
+        Args:
+            queries: L2-normalized query embeddings of shape (num_queries, dim)
+            top_k: Number of neighbors per query
+
+        Returns:
+            Tuple of (row indices, cosine similarities), each of shape
+            (num_queries, min(top_k, len(self))), sorted by descending score
+        """
+        k = min(top_k, len(self))
+        if k <= 0:
+            return np.zeros((len(queries), 0), dtype=np.int64), np.zeros((len(queries), 0), dtype=np.float32)
+        labels, distances = self.index.knn_query(queries, k=k, num_threads=self.config.num_threads)
+        return labels.astype(np.int64), 1.0 - distances
+
+def recall_report(index: HNSWIndex, scorer: DotProductScorer, queries: np.ndarray, top_k: int = 10,
+                  ef_values: Sequence[int] = (16, 32, 64, 128, 256)) -> List[Dict[str, float]]:
+    """Measure HNSW recall@k and latency against exact search.
+
+    Args:
+        index: HNSW index over the scorer's embeddings
+        scorer: Exact scorer used as ground truth
+        queries: Query embeddings of shape (num_queries, dim)
+        top_k: Number of neighbors compared per query
+        ef_values: Search-time ``ef`` values to evaluate
+
+    Returns:
+        One dictionary per ``ef`` with ``recall_at_k`` and per-query
+        milliseconds for ANN and exact search
+    """
+    queries = normalize_embeddings(queries)
+    num_queries = max(len(queries), 1)
+
+    start = time.perf_counter()
+    exact = [set(row) for row in top_k_indices(scorer.score_batch(queries), top_k)]
+    exact_ms = (time.perf_counter() - start) * 1000 / num_queries
+
+    report = []
+    try:
+        for ef in ef_values:
+            index.index.set_ef(ef)
+            start = time.perf_counter()
+            approximate, _ = index.search(queries, top_k)
+            ann_ms = (time.perf_counter() - start) * 1000 / num_queries
+            hits = sum(len(expected.intersection(row)) for expected, row in zip(exact, approximate))
+            total = sum(len(expected) for expected in exact)
+            report.append({
+                'ef': ef,
+                'recall_at_k': hits / total if total else 1.0,
+                'ann_ms_per_query': ann_ms,
+                'exact_ms_per_query': exact_ms,
+            })
+    finally:
+        index.index.set_ef(index.config.ef)
+    return report
@@ -0,0 +1,142 @@
+"""
+Grid index over latitude/longitude for radius and bounding-box queries.
+"""
+import math
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat: float, lon: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distances from one point to many.
+
+    Args:
+        lat: Latitude of the origin in degrees
+        lon: Longitude of the origin in degrees
+        latitudes: Latitudes of the targets in degrees
+        longitudes: Longitudes of the targets in degrees
+
+    Returns:
+        Distances in kilometers
+    """
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+class GeoIndex:
+    """Uniform grid of latitude/longitude cells mapping to row positions.
+
+    A query only visits the cells overlapping its bounding box and checks
+    exact distances for the rows in them, so spatial pruning costs time
+    proportional to the area searched rather than the corpus. Rows without
+    coordinates are never returned.
+    """
+
+    def __init__(self, cell_degrees: float = 0.01):
+        """Initialize an empty index.
+
+        Args:
+            cell_degrees: Cell size in degrees (0.01 is about 1.1 km of latitude)
+        """
+        self.cell_degrees = cell_degrees
+        self.latitudes = np.zeros(0, dtype=np.float64)
+        self.longitudes = np.zeros(0, dtype=np.float64)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.latitudes)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def add(self, latitudes: Iterable[float], longitudes: Iterable[float]):
+        """Append rows.
+
+        Args:
+            latitudes: Latitudes in degrees (NaN when unknown)
+            longitudes: Longitudes in degrees aligned with ``latitudes``
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        start = len(self)
+        for position in np.flatnonzero(np.isfinite(latitudes) & np.isfinite(longitudes)):
+            self._cells.setdefault(self._cell(latitudes[position], longitudes[position]), []).append(start + int(position))
+        self.latitudes = np.concatenate([self.latitudes, latitudes])
+        self.longitudes = np.concatenate([self.longitudes, longitudes])
+
+    def _rows_in_cells(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """Get the rows in the cells overlapping a bounding box."""
+        low_row, low_col = self._cell(min_lat, min_lon)
+        high_row, high_col = self._cell(max_lat, max_lon)
+        if (high_row - low_row + 1) * (high_col - low_col + 1) > len(self._cells):
+            # Large areas: scanning the occupied cells is cheaper than enumerating the box
+            cells = [rows for (row, col), rows in self._cells.items()
+                     if low_row <= row <= high_row and low_col <= col <= high_col]
+        else:
+            cells = [self._cells[(row, col)]
+                     for row in range(low_row, high_row + 1)
+                     for col in range(low_col, high_col + 1)
+                     if (row, col) in self._cells]
+        if not cells:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([np.asarray(rows, dtype=np.int64) for rows in cells])
+
+    def within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """Find the rows inside a bounding box.
+
+        Args:
+            min_lat: Southern edge in degrees
+            min_lon: Western edge in degrees
+            max_lat: Northern edge in degrees
+            max_lon: Eastern edge in degrees
+
+        Returns:
+            Sorted row positions
+        """
+        rows = self._rows_in_cells(min_lat, min_lon, max_lat, max_lon)
+        latitudes, longitudes = self.latitudes[rows], self.longitudes[rows]
+        inside = (latitudes >= min_lat) & (latitudes <= max_lat) & (longitudes >= min_lon) & (longitudes <= max_lon)
+        return np.sort(rows[inside])
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the rows within a distance of a point.
+
+        Args:
+            lat: Latitude of the center in degrees
+            lon: Longitude of the center in degrees
+            radius_km: Radius in kilometers
+
+        Returns:
+            Tuple of (sorted row positions, distances in kilometers)
+        """
+        lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+        lon_delta = lat_delta / max(math.cos(math.radians(min(abs(lat) + lat_delta, 90.0))), 1e-12)
+        rows = np.sort(self._rows_in_cells(lat - lat_delta, lon - lon_delta, lat + lat_delta, lon + lon_delta))
+        distances = haversine_km(lat, lon, self.latitudes[rows], self.longitudes[rows])
+        inside = distances <= radius_km
+        return rows[inside], distances[inside]
+
+    def mask(self, near: Tuple[float, float, float] = None,
+             bbox: Tuple[float, float, float, float] = None) -> np.ndarray:
+        """Evaluate spatial conditions over all rows.
+
+        Args:
+            near: Optional (latitude, longitude, radius in km)
+            bbox: Optional (min latitude, min longitude, max latitude, max longitude)
+
+        Returns:
+            Boolean array marking the rows that satisfy every condition
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if near is not None:
+            mask &= self._rows_mask(self.within_radius(*near)[0])
+        if bbox is not None:
+            mask &= self._rows_mask(self.within_bbox(*bbox))
+        return mask
+
+    def _rows_mask(self, rows: np.ndarray) -> np.ndarray:
+        """Convert row positions into a boolean array over all rows."""
+        selected = np.zeros(len(self), dtype=bool)
+        selected[rows] = True
+        return selected
@@ -0,0 +1,144 @@
+"""
+Streaming ingestion pipeline with bounded memory.
+"""
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Marks the end of a stage's output
+_DONE = object()
+
+class IngestionPipeline:
+    """Stream a CSV through text building, encoding and writing stages.
+
+    The CSV is read in chunks of ``chunk_size`` rows. Reading, text building
+    and encoding each run in their own thread, and writing (or consuming
+    ``stream``) runs in the calling thread. Stages are connected by queues holding at most
+    ``queue_size`` chunks, so parsing and writing overlap with model compute
+    while only a fixed number of chunks is in memory at any time.
+    """
+
+    def __init__(self,
+                 build_text: Callable[[pd.DataFrame], List[str]],
+                 encode: Callable[[List[str]], np.ndarray],
+                 write: Optional[Callable[[pd.DataFrame, np.ndarray], None]] = None,
+                 chunk_size: int = 1000,
+                 queue_size: int = 2):
+        """Initialize the pipeline.
+
+        Args:
+            build_text: Builds the embedding text for a chunk of rows
+            encode: Encodes a list of texts into an embeddings array
+            write: Persists a chunk of rows together with its embeddings; only
+                needed by ``run``
+            chunk_size: Number of CSV rows per chunk
+            queue_size: Maximum number of chunks buffered between two stages
+        """
+        self.build_text = build_text
+        self.encode = encode
+        self.write = write
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+
+    def run(self, data_path: str) -> int:
+        """Ingest a CSV file.
+
+        Args:
+            data_path: Path to the CSV file
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            Exception: The first error raised by any stage
+        """
+        num_rows = 0
+        for df, embeddings in self.stream(data_path):
+            self.write(df, embeddings)
+            num_rows += len(df)
+        return num_rows
+
+    def stream(self, data_path: str) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+        """Read, build and encode a CSV file, yielding chunks as they are ready.
+
+        Lets the caller pull encoded chunks, e.g. to feed a bulk uploader,
+        instead of pushing them through ``write``. Closing the generator
+        early stops the stages.
+
+        Args:
+            data_path: Path to the CSV file
+
+        Yields:
+            Tuples of (chunk of rows, embeddings aligned with the rows)
+
+        Raises:
+            Exception: The first error raised by any stage
+        """
+        stop = threading.Event()
+        errors = []
+
+        def put(q: queue.Queue, item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def drain(q: queue.Queue) -> Iterator[Any]:
+            while True:
+                try:
+                    item = q.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        return
+                    continue
+                if item is _DONE:
+                    return
+                yield item
+
+        def stage(items: Callable[[], Iterable[Any]], out_q: queue.Queue):
+            try:
+                for item in items():
+                    if not put(out_q, item):
+                        return
+                put(out_q, _DONE)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+        chunks_q = queue.Queue(maxsize=self.queue_size)
+        texts_q = queue.Queue(maxsize=self.queue_size)
+        vectors_q = queue.Queue(maxsize=self.queue_size)
+        threads = [
+            threading.Thread(
+                target=stage,
+                args=(lambda: pd.read_csv(data_path, chunksize=self.chunk_size), chunks_q),
+                daemon=True
+            ),
+            threading.Thread(
+                target=stage,
+                args=(lambda: ((df, self.build_text(df)) for df in drain(chunks_q)), texts_q),
+                daemon=True
+            ),
+            threading.Thread(
+                target=stage,
+                args=(lambda: ((df, self.encode(texts)) for df, texts in drain(texts_q)), vectors_q),
+                daemon=True
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            yield from drain(vectors_q)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
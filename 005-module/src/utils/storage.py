@@ -1,16 +1,23 @@
 """
 Storage utilities for persisting embeddings and vector database.
 """
+import json
 import os
-import pickle
+import shutil
 from pathlib import Path
 import numpy as np
-from typing import Optional, Tuple, Dict, Any
+import pandas as pd
+from typing import List, Optional, Tuple, Dict, Any
 
 # Define storage paths
 STORAGE_DIR = Path("storage")
 EMBEDDINGS_DIR = STORAGE_DIR / "embeddings"
 QDRANT_DIR = STORAGE_DIR / "qdrant_vdb"
+EMBEDDING_CACHE_PATH = EMBEDDINGS_DIR / "embedding_cache.sqlite"
+ENCODERS_DIR = STORAGE_DIR / "encoders"
+
+# Version of the embedding store layout recorded in its header
+STORE_FORMAT = 1
 
 def ensure_directories():
     """Create storage directories if they don't exist."""
@@ -18,49 +25,252 @@ def ensure_directories():
     EMBEDDINGS_DIR.mkdir(exist_ok=True)
     QDRANT_DIR.mkdir(exist_ok=True)
 
-def save_embeddings(engine_name: str, embeddings: np.ndarray, metadata: Dict[str, Any]):
+def _store_paths(engine_name: str) -> Tuple[Path, Path, Path]:
+    """Get the vector file, metadata directory and header of an embedding store."""
+    return (
+        EMBEDDINGS_DIR / f"{engine_name}_embeddings.npy",
+        EMBEDDINGS_DIR / f"{engine_name}_metadata",
+        EMBEDDINGS_DIR / f"{engine_name}_header.json",
+    )
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    """Write a JSON file, replacing any previous version atomically."""
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _write_part(metadata_dir: Path, index: int, metadata: pd.DataFrame) -> str:
+    """Write metadata rows as a Parquet part file.
+    
+    Object columns mixing value types (e.g. numbers and strings from added
+    rows) are stored as strings, since Parquet columns have a single type.
+    
+    Returns:
+        File name of the part
+    """
+    metadata = metadata.reset_index(drop=True)
+    for column in metadata.columns[metadata.dtypes == object]:
+        if pd.api.types.infer_dtype(metadata[column], skipna=True).startswith('mixed'):
+            metadata[column] = metadata[column].map(lambda value: value if pd.isna(value) else str(value))
+    name = f"part-{index:05d}.parquet"
+    metadata.to_parquet(metadata_dir / name, index=False)
+    return name
+
+def save_embeddings(engine_name: str, embeddings: np.ndarray, metadata: pd.DataFrame):
     """Save embeddings and metadata to disk.
     
+    Vectors go to a ``.npy`` file that is opened memory-mapped on load,
+    metadata to Parquet part files, and the row count and part list to a
+    small JSON header. The header is written last, so a store interrupted
+    mid-write is never loaded.
+    
     Args:
         engine_name: Name of the search engine
         embeddings: Numpy array of embeddings
-        metadata: Dictionary of metadata
+        metadata: DataFrame with one metadata row per embedding
     """
     ensure_directories()
+    embeddings_path, metadata_dir, header_path = _store_paths(engine_name)
+    header_path.unlink(missing_ok=True)
     
-    # Save embeddings
-    embeddings_path = EMBEDDINGS_DIR / f"{engine_name}_embeddings.npy"
-    np.save(embeddings_path, embeddings)
+    # Replaced rather than overwritten, so existing memory maps of the old file stay valid
+    tmp_path = embeddings_path.with_suffix('.tmp.npy')
+    np.save(tmp_path, np.ascontiguousarray(embeddings, dtype=np.float32))
+    os.replace(tmp_path, embeddings_path)
     
-    # Save metadata
-    metadata_path = EMBEDDINGS_DIR / f"{engine_name}_metadata.pkl"
-    with open(metadata_path, 'wb') as f:
-        pickle.dump(metadata, f)
+    shutil.rmtree(metadata_dir, ignore_errors=True)
+    metadata_dir.mkdir()
+    part = _write_part(metadata_dir, 0, metadata)
+    _write_json(header_path, {
+        'format': STORE_FORMAT,
+        'rows': len(embeddings),
+        'dimension': int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+        'dtype': 'float32',
+        'parts': [[part, len(metadata)]],
+    })
+    
+    # A rewritten store invalidates any index or manifest describing the old rows
+    get_ann_index_path(engine_name).unlink(missing_ok=True)
+    get_bm25_index_path(engine_name).unlink(missing_ok=True)
+    get_manifest_path(engine_name).unlink(missing_ok=True)
+    (EMBEDDINGS_DIR / f"{engine_name}_metadata.pkl").unlink(missing_ok=True)
 
-def load_embeddings(engine_name: str) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+def _load_header(engine_name: str) -> Optional[Dict[str, Any]]:
+    """Load the header of an embedding store, or None if it has none or an unknown format."""
+    header_path = _store_paths(engine_name)[2]
+    if not header_path.exists():
+        return None
+    with open(header_path) as f:
+        header = json.load(f)
+    return header if header.get('format') == STORE_FORMAT else None
+
+def load_embeddings(engine_name: str, columns: Optional[List[str]] = None) -> Optional[Tuple[np.ndarray, pd.DataFrame]]:
     """Load embeddings and metadata from disk.
     
+    Embeddings are memory-mapped read-only, so loading doesn't read the
+    vectors and processes on one host share their pages.
+    
     Args:
         engine_name: Name of the search engine
+        columns: Metadata columns to read; defaults to all
         
     Returns:
         Tuple of (embeddings, metadata) if found, None otherwise
     """
-    embeddings_path = EMBEDDINGS_DIR / f"{engine_name}_embeddings.npy"
-    metadata_path = EMBEDDINGS_DIR / f"{engine_name}_metadata.pkl"
-    
-    if not (embeddings_path.exists() and metadata_path.exists()):
+    header = _load_header(engine_name)
+    embeddings_path, metadata_dir, _ = _store_paths(engine_name)
+    if header is None or not embeddings_path.exists():
         return None
     
-    # Load embeddings
-    embeddings = np.load(embeddings_path)
+    # Rows past the header's count belong to an interrupted append
+    embeddings = np.load(embeddings_path, mmap_mode='r')
+    if len(embeddings) < header['rows']:
+        return None
+    embeddings = embeddings[:header['rows']]
     
-    # Load metadata
-    with open(metadata_path, 'rb') as f:
-        metadata = pickle.load(f)
+    frames = [pd.read_parquet(metadata_dir / part, columns=columns) for part, _ in header['parts']]
+    metadata = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    if len(metadata) != len(embeddings):
+        return None
     
     return embeddings, metadata
 
+def _append_to_npy(path: Path, array: np.ndarray) -> bool:
+    """Append rows to a 2-D ``.npy`` file in place.
+    
+    The new rows are written at the end of the file and only the header's
+    shape is rewritten, using the padding numpy reserves for growth.
+    
+    Args:
+        path: Path to the existing ``.npy`` file
+        array: Rows to append
+        
+    Returns:
+        True if the rows were appended, False if the file can't be grown in place
+    """
+    with open(path, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        header_start = 10 if version == (1, 0) else 12
+        data_start = f.tell()
+        
+        if fortran_order or len(shape) != 2 or array.ndim != 2 or array.shape[1] != shape[1]:
+            return False
+        
+        # The new header must fit in the space of the old one
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(dtype),
+            'fortran_order': False,
+            'shape': (shape[0] + array.shape[0], shape[1]),
+        })
+        header_size = data_start - header_start
+        if len(header) + 1 > header_size:
+            return False
+        
+        # Write data first so a crash never leaves a header pointing past the end
+        f.seek(data_start + shape[0] * shape[1] * dtype.itemsize)
+        f.write(np.ascontiguousarray(array, dtype=dtype).tobytes())
+        f.truncate()
+        
+        f.seek(header_start)
+        f.write((header.ljust(header_size - 1) + '\n').encode('latin1'))
+    return True
+
+def append_embeddings(engine_name: str, embeddings: np.ndarray, metadata: pd.DataFrame) -> bool:
+    """Append embeddings and metadata rows to an existing store.
+    
+    Only the new rows are written: vectors are appended to the ``.npy``
+    file, metadata is added as a new Parquet part and the header is
+    updated last.
+    
+    Args:
+        engine_name: Name of the search engine
+        embeddings: Numpy array of new embeddings
+        metadata: DataFrame with the metadata rows for the new embeddings
+        
+    Returns:
+        True if the rows were appended, False if there is no store to append
+        to or it can't be grown in place (callers should fall back to
+        ``save_embeddings``)
+    """
+    header = _load_header(engine_name)
+    embeddings_path, metadata_dir, header_path = _store_paths(engine_name)
+    if header is None or not embeddings_path.exists():
+        return False
+    if len(np.load(embeddings_path, mmap_mode='r')) != header['rows']:
+        return False
+    if not _append_to_npy(embeddings_path, embeddings):
+        return False
+    
+    part = _write_part(metadata_dir, len(header['parts']), metadata)
+    header['rows'] += len(embeddings)
+    header['parts'].append([part, len(metadata)])
+    _write_json(header_path, header)
+    return True
+
+def get_manifest_path(engine_name: str) -> Path:
+    """Get the path of the manifest describing an embedding store.
+    
+    Args:
+        engine_name: Name of the search engine
+        
+    Returns:
+        Path to the JSON manifest
+    """
+    return EMBEDDINGS_DIR / f"{engine_name}_manifest.json"
+
+def save_manifest(engine_name: str, manifest: Dict[str, Any]):
+    """Write the manifest of an embedding store, replacing any previous one atomically.
+    
+    Args:
+        engine_name: Name of the search engine
+        manifest: JSON-serializable description of the store
+    """
+    ensure_directories()
+    _write_json(get_manifest_path(engine_name), manifest)
+
+def load_manifest(engine_name: str) -> Optional[Dict[str, Any]]:
+    """Load the manifest of an embedding store.
+    
+    Args:
+        engine_name: Name of the search engine
+        
+    Returns:
+        The manifest, or None if the store has none
+    """
+    path = get_manifest_path(engine_name)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def get_ann_index_path(engine_name: str) -> Path:
+    """Get the path of the ANN index persisted next to an embedding store.
+    
+    Args:
+        engine_name: Name of the search engine
+        
+    Returns:
+        Path to the HNSW index file
+    """
+    return EMBEDDINGS_DIR / f"{engine_name}_hnsw.bin"
+
+def get_bm25_index_path(name: str) -> Path:
+    """Get the path of the BM25 index persisted for an engine or collection.
+    
+    Args:
+        name: Name of the search engine or Qdrant collection
+        
+    Returns:
+        Path to the BM25 index file
+    """
+    ensure_directories()
+    return EMBEDDINGS_DIR / f"{name}_bm25.npz"
+
 def get_qdrant_path() -> Path:
     """Get the path to the Qdrant vector database directory.
     
@@ -68,4 +278,26 @@ def get_qdrant_path() -> Path:
         Path to Qdrant directory
     """
     ensure_directories()
-    return QDRANT_DIR 
\ No newline at end of file
+    return QDRANT_DIR
+
+def get_embedding_cache_path() -> Path:
+    """Get the path to the shared embedding cache database.
+    
+    Returns:
+        Path to the embedding cache file
+    """
+    ensure_directories()
+    return EMBEDDING_CACHE_PATH
+
+def get_encoder_export_path(model_name: str) -> Path:
+    """Get the directory for locally exported encoder graphs of a model.
+    
+    Args:
+        model_name: Name or path of the SentenceTransformer model
+        
+    Returns:
+        Path to the model's export directory
+    """
+    path = ENCODERS_DIR / model_name.replace("/", "__")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
\ No newline at end of file
@@ -131,6 +131,8 @@ Snippet: {stock.snippet}
 
     def launch(self):
         def gradio_fn(symbol):
+            # The input is a ticker field, so "aapl" resolves like "AAPL"
+            symbol = (symbol or "").strip().upper()
             result = self.analyze_stock(symbol)
             # Ensure result is a tuple of four strings
             if not isinstance(result, tuple) or len(result) != 4:
@@ -371,11 +371,11 @@ Please analyze these results and provide insights."""
         query_embedding = self.model.encode(query)
         
         # Search in Qdrant
-        search_results = self.qdrant_client.search(
+        search_results = self.qdrant_client.query_points(
             collection_name=self.collection_name,
-            query_vector=query_embedding.tolist(),
+            query=query_embedding.tolist(),
             limit=top_k * 2  # Get more results to filter by stock
-        )
+        ).points
         
         # Group results by stock and get best chunk for each
         stock_scores = {}
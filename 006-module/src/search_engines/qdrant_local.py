@@ -3,130 +3,265 @@ Local Qdrant vector search engine implementation.
 """
 import os
 import uuid
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
-from sentence_transformers import SentenceTransformer
+import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
-from qdrant_client.http.models import Distance, VectorParams
 from .base import StockSearchEngine, StockResult, SearchError
 from utils.logger import timeit, log_errors
-from utils.storage import get_qdrant_path
+from utils.embedding_cache import get_embedding_cache
+from utils.query_cache import get_query_cache
+from utils.encoders import get_encoder, get_default_backend, get_model_key
+from utils.parallel_encoder import ParallelEncoder
+from utils.documents import DocumentBuilder, STOCK_FIELDS
+from utils.pipeline import IngestionPipeline
+from utils.bm25 import BM25Index, reciprocal_rank_fusion
+from utils.symbol_index import SymbolIndex
+from utils.reranker import RerankConfig, apply_rerank, get_reranker
+from utils.filters import NUMERIC, STOCK_FILTERS, filter_payloads, normalize_filters
+from utils.storage import get_bm25_index_path
+from utils.qdrant_profiles import deferred_indexing, get_alias_target, get_collection_profile, get_qdrant_client, swap_alias
+from utils.fingerprint import dataset_fingerprint
 
 class QdrantLocalSearchEngine(StockSearchEngine):
     """Local Qdrant-based stock market search engine."""
     
-    def __init__(self, data_path: str = "data/2022_03_17_02_06_nasdaq.csv"):
+    def __init__(self, data_path: str = "data/2022_03_17_02_06_nasdaq.csv", encode_workers: int = 1,
+                 ingest_chunk_size: int = 1000,
+                 encoder_backend: str = None,
+                 hybrid: bool = True,
+                 fusion_candidates: int = 50,
+                 rerank_config: RerankConfig = None,
+                 collection_profile: str = 'latency',
+                 upload_batch_size: int = 256,
+                 upload_parallel: int = 1):
         """Initialize the Qdrant local search engine.
         
         Args:
             data_path: Path to the CSV file containing stock market data
+            encode_workers: Number of worker processes used to embed documents (1 encodes in-process)
+            ingest_chunk_size: Number of CSV rows read, encoded and written per pipeline step
+            encoder_backend: Encoder inference backend ('torch', 'onnx' or 'onnx-int8'); defaults to EMBEDDING_BACKEND
+            hybrid: Fuse BM25 keyword matches with dense scores; False searches dense-only
+            fusion_candidates: Number of dense and lexical candidates fused per query
+            rerank_config: Cross-encoder re-ranking parameters; None skips re-ranking
+            collection_profile: Collection profile ('latency' or 'memory') used when creating
+                the collection and for search parameters
+            upload_batch_size: Number of points sent per upload request when indexing
+            upload_parallel: Number of processes uploading batches concurrently (server mode only)
         """
         try:
             # Initialize model
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-            self.vector_size = self.model.get_sentence_embedding_dimension()
+            self.model_name = 'all-MiniLM-L6-v2'
+            self.encoder_backend = encoder_backend or get_default_backend()
+            self.model = get_encoder(self.model_name, self.encoder_backend)
+            self.model_key = get_model_key(self.model_name, self.encoder_backend)
+            self.encoder = ParallelEncoder(self.model, num_workers=encode_workers)
+            self.ingest_chunk_size = ingest_chunk_size
+            self.upload_batch_size = upload_batch_size
+            self.upload_parallel = upload_parallel
+            self.document_builder = DocumentBuilder(STOCK_FIELDS)
+            self.fusion_candidates = fusion_candidates
+            self.bm25 = BM25Index() if hybrid else None
+            self.symbol_index = SymbolIndex()
+            self.filter_fields = STOCK_FILTERS
+            self.rerank_config = rerank_config
+            self.reranker = get_reranker(rerank_config.model_name, rerank_config.max_length) if rerank_config else None
             
-            # Initialize Qdrant client with persistent storage
-            qdrant_path = get_qdrant_path()
-            self.qdrant_client = QdrantClient(path=str(qdrant_path))
+            # Initialize Qdrant client with persistent storage (or the server at QDRANT_URL)
+            self.profile = get_collection_profile(collection_profile)
+            self.qdrant_client = get_qdrant_client()
             self.collection_name = "stock_chunks"
             
-            # Check if collection exists
-            collections = self.qdrant_client.get_collections().collections
-            collection_names = [collection.name for collection in collections]
-            
-            if self.collection_name not in collection_names:
-                # Create collection if it doesn't exist
-                self.qdrant_client.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config=VectorParams(
-                        size=self.vector_size,
-                        distance=Distance.COSINE
-                    )
-                )
+            # Searches go through an alias pointing at the collection built for the
+            # current data, model and schema
+            self.collection_version = f"{self.collection_name}_{self._fingerprint(data_path)}"
+            
+            if get_alias_target(self.qdrant_client, self.collection_name) != self.collection_version:
+                # Build the new version next to the live one; a leftover of an interrupted build is discarded
+                if self.qdrant_client.collection_exists(self.collection_version):
+                    self.qdrant_client.delete_collection(self.collection_version)
+                # Only a build needs the model loaded; reusing a collection defers it to the first search
+                self.profile.create_collection(self.qdrant_client, self.collection_version,
+                                               self.model.get_sentence_embedding_dimension())
+                self._create_payload_indexes()
                 # Load and index data
                 self._load_and_index_data(data_path)
-                print("Created new Qdrant collection and indexed data")
+                # Swap the alias only once the new version is complete
+                previous = swap_alias(self.qdrant_client, self.collection_name, self.collection_version)
+                if previous is not None:
+                    get_bm25_index_path(previous).unlink(missing_ok=True)
+                print(f"Created Qdrant collection {self.collection_version} and indexed data")
             else:
-                print("Using existing Qdrant collection")
+                self._load_payload_indexes()
+                print(f"Using existing Qdrant collection {self.collection_version}")
                 
         except Exception as e:
             raise SearchError(f"Failed to initialize search engine: {str(e)}")
     
+    def _fingerprint(self, data_path: str) -> str:
+        """Fingerprint the stock data, embedding model and document schema.
+        
+        Args:
+            data_path: Path to the CSV file
+            
+        Returns:
+            Short hex fingerprint naming the collection version
+        """
+        schema = {
+            'text': self.document_builder.fields,
+            'filters': {name: kind for name, (kind, _) in self.filter_fields.items()}
+        }
+        return dataset_fingerprint(data_path, self.model_key, schema)
+    
     def _load_and_index_data(self, data_path: str) -> None:
         """Load stock market data and index it in Qdrant.
         
+        The CSV is streamed in chunks; reading, text building and encoding
+        run as pipelined stages so memory use stays flat regardless of file
+        size. Encoded points are streamed into one bulk upload, sent in
+        batches of ``upload_batch_size`` by ``upload_parallel`` processes,
+        with HNSW indexing deferred until every point is stored.
+        
         Args:
             data_path: Path to the CSV file
         """
         try:
-            # Load data
-            self.stocks_df = pd.read_csv(data_path)
-            
-            # Index each stock
-            for idx, row in self.stocks_df.iterrows():
-                # Get text for embedding
-                text = self._get_text_for_embedding(row)
-                
-                # Compute embedding
-                embedding = self.model.encode(text)
-                
-                # Create metadata
-                metadata = {
-                    'symbol': row['symbol'],
-                    'name': row['name'],
-                    'sector': row['sector'] if 'sector' in row and pd.notna(row['sector']) else None,
-                    'industry': row['industry'] if 'industry' in row and pd.notna(row['industry']) else None,
-                    'market_cap': row['market_cap'] if 'market_cap' in row and pd.notna(row['market_cap']) else None
-                }
-                
-                # Generate UUID for point ID
-                point_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{row['symbol']}_{idx}"))
-                
-                # Add to Qdrant
-                self.qdrant_client.upsert(
-                    collection_name=self.collection_name,
-                    points=[
-                        models.PointStruct(
-                            id=point_id,
-                            vector=embedding.tolist(),
-                            payload=metadata
-                        )
-                    ]
+            pipeline = IngestionPipeline(
+                build_text=lambda df: self.document_builder.build(df).tolist(),
+                encode=lambda texts: get_embedding_cache().encode(self.encoder, texts, self.model_key),
+                chunk_size=self.ingest_chunk_size
+            )
+            points = (
+                point
+                for df, embeddings in pipeline.stream(data_path)
+                for point in self._index_rows(df, embeddings)
+            )
+            with self.encoder, deferred_indexing(self.qdrant_client, self.collection_version):
+                self.qdrant_client.upload_points(
+                    collection_name=self.collection_version,
+                    points=points,
+                    batch_size=self.upload_batch_size,
+                    parallel=self.upload_parallel,
+                    wait=True
                 )
+            if self.bm25 is not None:
+                self.bm25.save(get_bm25_index_path(self.collection_version))
                 
         except Exception as e:
             raise SearchError(f"Failed to load and index data: {str(e)}")
     
-    def _get_text_for_embedding(self, row: pd.Series) -> str:
-        """Combine available text fields for embedding.
+    def _get_metadata(self, row: pd.Series) -> Dict[str, Any]:
+        """Build the Qdrant payload for a stock row.
         
         Args:
             row: DataFrame row containing stock data
             
         Returns:
-            Combined text string
+            Payload dictionary
         """
-        text_parts = []
-        text_parts.append(str(row['symbol']))
-        text_parts.append(str(row['name']))
-        if 'sector' in row and pd.notna(row['sector']):
-            text_parts.append(str(row['sector']))
-        if 'industry' in row and pd.notna(row['industry']):
-            text_parts.append(str(row['industry']))
-        if 'description' in row and pd.notna(row['description']):
-            text_parts.append(str(row['description']))
-        return " ".join([part for part in text_parts if part.lower() != 'nan'])
+        return {
+            'symbol': row['symbol'],
+            'name': row['name'],
+            'sector': row['sector'] if 'sector' in row and pd.notna(row['sector']) else None,
+            'industry': row['industry'] if 'industry' in row and pd.notna(row['industry']) else None,
+            'market_cap': row['market_cap'] if 'market_cap' in row and pd.notna(row['market_cap']) else None
+        }
+    
+    def _create_payload_indexes(self) -> None:
+        """Index the parsed filter fields so filtered searches don't scan every payload."""
+        for name, (kind, _) in self.filter_fields.items():
+            self.qdrant_client.create_payload_index(
+                collection_name=self.collection_version,
+                field_name=f'filters.{name}',
+                field_schema=models.PayloadSchemaType.FLOAT if kind == NUMERIC else models.PayloadSchemaType.KEYWORD
+            )
+    
+    def _load_payload_indexes(self) -> None:
+        """Rebuild the in-memory indexes of an existing collection.
+        
+        The symbol index is rebuilt from payloads. The BM25 index is loaded
+        from storage and only rebuilt from payloads if it is missing or
+        doesn't match the collection.
+        """
+        path = get_bm25_index_path(self.collection_version)
+        rebuild_bm25 = False
+        if self.bm25 is not None:
+            loaded = BM25Index.load(path)
+            if loaded is not None and len(loaded) == self.qdrant_client.count(self.collection_version).count:
+                self.bm25 = loaded
+            else:
+                rebuild_bm25 = True
+        
+        offset = None
+        while True:
+            points, offset = self.qdrant_client.scroll(
+                collection_name=self.collection_version,
+                limit=1000,
+                offset=offset,
+                with_payload=True if rebuild_bm25 else ['symbol', 'name'],
+                with_vectors=False
+            )
+            self.symbol_index.add(
+                [point.payload.get('symbol') for point in points],
+                [point.payload.get('name') for point in points],
+                [point.id for point in points]
+            )
+            if rebuild_bm25 and points:
+                texts = self.document_builder.build(pd.DataFrame([point.payload for point in points]))
+                self.bm25.add(texts, [point.id for point in points])
+            if offset is None:
+                break
+        
+        if rebuild_bm25:
+            self.bm25.save(path)
+    
+    def _index_rows(self, df: pd.DataFrame, embeddings: np.ndarray) -> List[models.PointStruct]:
+        """Build the Qdrant points for a chunk of stock rows and index them in memory.
+        
+        Args:
+            df: Chunk of stock rows
+            embeddings: Embeddings aligned with ``df``
+            
+        Returns:
+            Points to upload
+        """
+        points = []
+        filters = filter_payloads(df, self.filter_fields)
+        for (idx, row), embedding, row_filters in zip(df.iterrows(), embeddings, filters):
+            # Generate UUID for point ID
+            point_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{row['symbol']}_{idx}"))
+            points.append(models.PointStruct(
+                id=point_id,
+                vector=embedding.tolist(),
+                payload={**self._get_metadata(row), 'filters': row_filters}
+            ))
+        
+        if self.bm25 is not None:
+            self.bm25.add(self.document_builder.build(df), [point.id for point in points])
+        self.symbol_index.add(df['symbol'], df['name'], [point.id for point in points])
+        return points
     
     @timeit
     @log_errors
-    def search(self, query: str, top_k: int = 5) -> List[StockResult]:
-        """Search for stocks using local Qdrant.
+    def search(self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[StockResult]:
+        """Search for stocks using local Qdrant fused with BM25.
+        
+        Tickers ("AAPL", "$aapl") and exact company names are resolved
+        through the symbol index and fetched by point id, with a score of
+        1.0. The remaining slots are filled by fusing vector and BM25 hits
+        with reciprocal rank fusion; short queries made of rare indexed
+        terms are answered by the inverted index alone, without encoding
+        the query. With ``rerank_config``, the leading fused candidates are
+        re-scored by a cross-encoder and carry its scores.
         
         Args:
             query: Search query string
             top_k: Number of results to return
+            filters: Optional conditions on ``STOCK_FILTERS`` fields, e.g.
+                ``{'sector': 'Technology', 'market_cap': {'gte': '1,000,000,000'}}``;
+                evaluated by Qdrant against the indexed filter payload
             
         Returns:
             List of StockResult objects
@@ -135,30 +270,208 @@ class QdrantLocalSearchEngine(StockSearchEngine):
             SearchError: If the search fails
         """
         try:
-            # Encode query
-            query_embedding = self.model.encode(query)
-            
-            # Search in Qdrant
-            search_results = self.qdrant_client.search(
-                collection_name=self.collection_name,
-                query_vector=query_embedding.tolist(),
-                limit=top_k
-            )
+            payloads = {}
+            query_filter = self._build_filter(filters)
             
-            # Convert to StockResult objects
-            stock_results = []
-            for result in search_results:
-                payload = result.payload
-                stock_results.append(StockResult(
-                    title=payload['name'],
-                    url=payload.get('website', ''),
-                    snippet=payload.get('description', ''),
-                    score=result.score,
-                    source='qdrant_local',
-                    metadata=payload
-                ))
-            
-            return stock_results
+            # Tickers and exact company names resolve without the encoder
+            exact_ids = self.symbol_index.lookup(query)
+            if query_filter is not None:
+                exact_ids = self._matching_ids(exact_ids, query_filter, payloads)
+            exact_ids = exact_ids[:top_k]
+            ranked = []
+            if len(exact_ids) < top_k:
+                num_results = top_k + len(exact_ids)
+                num_ranked = self._num_ranked(num_results)
+                
+                # Obvious keyword queries are answered by the inverted index alone
+                lexical_ids, lexical_only = self._lexical_candidates(query, num_results, query_filter, payloads)
+                if lexical_only:
+                    ranked = reciprocal_rank_fusion([lexical_ids])[:num_ranked]
+                else:
+                    ranked = self._dense_ranking(query, num_ranked, lexical_ids, payloads, query_filter)
+                ranked = self._rerank(query, [entry for entry in ranked if entry[0] not in exact_ids], payloads)
+            
+            # Convert to StockResult objects, after any exact matches
+            ranked = [(point_id, 1.0) for point_id in exact_ids] + [
+                (point_id, score) for point_id, score in ranked if point_id not in exact_ids
+            ]
+            return self._fetch_results(ranked[:top_k], payloads)
             
         except Exception as e:
-            raise SearchError(f"Qdrant search failed: {str(e)}") 
\ No newline at end of file
+            raise SearchError(f"Qdrant search failed: {str(e)}")
+
+    def _num_candidates(self, top_k: int) -> int:
+        """Number of dense candidates needed for ``top_k`` results."""
+        return top_k if self.bm25 is None else max(top_k, self.fusion_candidates)
+
+    def _num_ranked(self, top_k: int) -> int:
+        """Number of ranked candidates kept for ``top_k`` results, enough to feed the re-ranker."""
+        return top_k if self.reranker is None else max(top_k, self.rerank_config.candidates)
+
+    def _rerank(self, query: str, ranked: List[Tuple[str, float]],
+                payloads: Dict[str, Dict[str, Any]]) -> List[Tuple[str, float]]:
+        """Re-score the leading candidates with the cross-encoder.
+        
+        Args:
+            query: Search query string
+            ranked: (point id, score) pairs, best first
+            payloads: Payloads by point id, filled in place with fetched candidates
+            
+        Returns:
+            Ranking with up to ``rerank_config.candidates`` leading entries
+            reordered by cross-encoder score; unchanged without a reranker
+        """
+        if self.reranker is None:
+            return ranked
+        self._fetch_payloads([point_id for point_id, _ in ranked], payloads)
+        ranked = [(point_id, score) for point_id, score in ranked if point_id in payloads]
+        head = ranked[:self.rerank_config.candidates]
+        documents = self.document_builder.build(pd.DataFrame([payloads[point_id] for point_id, _ in head])).tolist()
+        return apply_rerank(ranked, self.reranker.rerank(query, documents, self.rerank_config))
+
+    def _build_filter(self, filters: Optional[Dict[str, Any]]) -> Optional[models.Filter]:
+        """Translate search filters into a Qdrant filter on the parsed filter payload.
+        
+        Args:
+            filters: Conditions on ``STOCK_FILTERS`` fields, or None
+            
+        Returns:
+            Qdrant filter, or None when there are no filters
+        """
+        if not filters:
+            return None
+        conditions = []
+        for name, condition in normalize_filters(filters, self.filter_fields).items():
+            if isinstance(condition, dict):
+                conditions.append(models.FieldCondition(key=f'filters.{name}', range=models.Range(**condition)))
+            else:
+                conditions.append(models.FieldCondition(key=f'filters.{name}', match=models.MatchAny(any=condition)))
+        return models.Filter(must=conditions)
+
+    def _matching_ids(self, point_ids: List[str], query_filter: models.Filter,
+                      payloads: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Keep the points that satisfy a filter, preserving their order.
+        
+        Args:
+            point_ids: Candidate point ids
+            query_filter: Qdrant filter to check
+            payloads: Payloads by point id, filled in place with the matching points
+            
+        Returns:
+            Matching point ids in their original order
+        """
+        if not point_ids:
+            return []
+        points, _ = self.qdrant_client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=models.Filter(must=[models.HasIdCondition(has_id=point_ids), query_filter]),
+            limit=len(point_ids),
+            with_payload=True,
+            with_vectors=False
+        )
+        payloads.update((point.id, point.payload) for point in points)
+        matching = {point.id for point in points}
+        return [point_id for point_id in point_ids if point_id in matching]
+
+    def _lexical_candidates(self, query: str, top_k: int, query_filter: Optional[models.Filter] = None,
+                            payloads: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[List[str], bool]:
+        """Get BM25 hits for a query.
+        
+        Args:
+            query: Search query string
+            top_k: Number of results the caller needs
+            query_filter: Optional Qdrant filter the hits must satisfy
+            payloads: Payloads by point id, filled in place with filtered hits
+            
+        Returns:
+            Tuple of (point ids, whether the hits alone answer the query)
+        """
+        if self.bm25 is None:
+            return [], False
+        num_candidates = self._num_candidates(top_k)
+        if query_filter is None:
+            point_ids, _ = self.bm25.search(query, num_candidates)
+        else:
+            # Over-fetch so enough hits survive the filter
+            point_ids, _ = self.bm25.search(query, 4 * num_candidates)
+            point_ids = self._matching_ids(point_ids, query_filter, {} if payloads is None else payloads)[:num_candidates]
+        return point_ids, len(point_ids) >= top_k and self.bm25.is_keyword_query(query)
+
+    def _dense_ranking(self, query: str, top_k: int, lexical_ids: List[str],
+                       payloads: Dict[str, Dict[str, Any]],
+                       query_filter: Optional[models.Filter] = None) -> List[Tuple[str, float]]:
+        """Rank points by vector search, fused with the lexical hits.
+        
+        Args:
+            query: Search query string
+            top_k: Number of results to rank
+            lexical_ids: BM25 candidates, best first
+            payloads: Payloads by point id, filled in place with search hits
+            query_filter: Optional Qdrant filter applied during vector search
+            
+        Returns:
+            (point id, score) pairs; cosine scores for dense-only engines,
+            reciprocal rank fusion scores otherwise
+        """
+        # Encode query (repeats are served from the query cache)
+        query_embedding = get_query_cache().encode(self.model, query, self.model_key)
+        
+        # Search in Qdrant
+        search_results = self.qdrant_client.query_points(
+            collection_name=self.collection_name,
+            query=query_embedding.tolist(),
+            query_filter=query_filter,
+            search_params=self.profile.search_params(),
+            limit=self._num_candidates(top_k)
+        ).points
+        payloads.update((result.id, result.payload) for result in search_results)
+        
+        if self.bm25 is None:
+            return [(result.id, result.score) for result in search_results][:top_k]
+        return reciprocal_rank_fusion([[result.id for result in search_results], lexical_ids])[:top_k]
+
+    def _fetch_results(self, ranked: List[Tuple[str, float]], payloads: Dict[str, Dict[str, Any]]) -> List[StockResult]:
+        """Build results for ranked points, fetching payloads not already known.
+        
+        Args:
+            ranked: (point id, score) pairs, best first
+            payloads: Payloads by point id from vector search
+            
+        Returns:
+            List of StockResult objects in ranked order
+        """
+        self._fetch_payloads([point_id for point_id, _ in ranked], payloads)
+        return [self._make_result(payloads[point_id], score) for point_id, score in ranked if point_id in payloads]
+
+    def _fetch_payloads(self, point_ids: List[str], payloads: Dict[str, Dict[str, Any]]) -> None:
+        """Retrieve the payloads of points not already in ``payloads``.
+        
+        Args:
+            point_ids: Point ids whose payloads are needed
+            payloads: Payloads by point id, filled in place
+        """
+        missing = [point_id for point_id in point_ids if point_id not in payloads]
+        if missing:
+            payloads.update(
+                (point.id, point.payload)
+                for point in self.qdrant_client.retrieve(collection_name=self.collection_name, ids=missing)
+            )
+
+    def _make_result(self, payload: Dict[str, Any], score: float) -> StockResult:
+        """Build the result for a stock payload.
+        
+        Args:
+            payload: Qdrant point payload
+            score: Similarity score
+            
+        Returns:
+            StockResult for the payload
+        """
+        return StockResult(
+            title=payload['name'],
+            url=payload.get('website', ''),
+            snippet=payload.get('description', ''),
+            score=score,
+            source='qdrant_local',
+            metadata={key: value for key, value in payload.items() if key != 'filters'}
+        )
\ No newline at end of file
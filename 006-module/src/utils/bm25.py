@@ -0,0 +1,201 @@
+"""
+In-process BM25 inverted index and rank fusion.
+"""
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from .scoring import top_k_indices
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case-folded word tokens."""
+    return TOKEN_PATTERN.findall(str(text).casefold())
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Any]], k: int = 60) -> List[Tuple[Any, float]]:
+    """Fuse ranked lists with reciprocal rank fusion (RRF).
+
+    Each key scores ``sum(1 / (k + rank))`` over the lists it appears in,
+    so lists with incomparable score scales (BM25, cosine) can be combined.
+
+    Args:
+        rankings: Ranked lists of keys, best first
+        k: Rank offset; larger values flatten the contribution of top ranks
+
+    Returns:
+        (key, fused score) pairs sorted by descending score
+    """
+    scores: Dict[Any, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of term postings.
+
+    Each term maps to the positions of the documents containing it and
+    the term frequencies there, so a query only touches the postings of
+    its own terms. Hits are reported as document keys, which default to
+    insertion positions.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Initialize an empty index.
+
+        Args:
+            k1: Term-frequency saturation
+            b: Document-length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.keys: List[Any] = []
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, texts: Iterable[str], keys: Optional[Iterable[Any]] = None):
+        """Index documents.
+
+        Args:
+            texts: Document texts
+            keys: Keys reported for the documents; defaults to their positions
+        """
+        start = len(self)
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        lengths = []
+        for position, text in enumerate(texts, start):
+            counts = Counter(tokenize(text))
+            lengths.append(sum(counts.values()))
+            for term, count in counts.items():
+                positions, frequencies = postings.setdefault(term, ([], []))
+                positions.append(position)
+                frequencies.append(count)
+
+        for term, (positions, frequencies) in postings.items():
+            positions = np.asarray(positions, dtype=np.int32)
+            frequencies = np.asarray(frequencies, dtype=np.float32)
+            if term in self._postings:
+                old_positions, old_frequencies = self._postings[term]
+                positions = np.concatenate([old_positions, positions])
+                frequencies = np.concatenate([old_frequencies, frequencies])
+            self._postings[term] = (positions, frequencies)
+
+        self.doc_lengths = np.concatenate([self.doc_lengths, np.asarray(lengths, dtype=np.float32)])
+        self.keys.extend(range(start, len(self)) if keys is None else keys)
+
+    def score(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Score the documents containing any query term.
+
+        Args:
+            query: Raw query text
+
+        Returns:
+            Tuple of (document positions, BM25 scores) for matching documents
+        """
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self._postings]
+        if not terms:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+
+        num_docs = len(self)
+        average_length = float(self.doc_lengths.mean())
+        all_positions, all_scores = [], []
+        for term in terms:
+            positions, frequencies = self._postings[term]
+            idf = np.log1p((num_docs - len(positions) + 0.5) / (len(positions) + 0.5))
+            norm = frequencies + self.k1 * (1 - self.b + self.b * self.doc_lengths[positions] / average_length)
+            all_positions.append(positions)
+            all_scores.append(idf * frequencies * (self.k1 + 1) / norm)
+
+        positions, inverse = np.unique(np.concatenate(all_positions), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(all_scores)).astype(np.float32)
+        return positions, scores
+
+    def search(self, query: str, top_k: int, mask: Optional[np.ndarray] = None) -> Tuple[List[Any], np.ndarray]:
+        """Find the best BM25 matches for a query.
+
+        Args:
+            query: Raw query text
+            top_k: Maximum number of hits
+            mask: Optional boolean array over document positions; documents
+                where it is False are skipped
+
+        Returns:
+            Tuple of (document keys, BM25 scores), best first
+        """
+        positions, scores = self.score(query)
+        if mask is not None:
+            allowed = mask[positions]
+            positions, scores = positions[allowed], scores[allowed]
+        top = top_k_indices(scores, top_k)
+        return [self.keys[position] for position in positions[top]], scores[top]
+
+    def is_keyword_query(self, query: str, max_terms: int = 3, max_df_ratio: float = 0.02) -> bool:
+        """Check whether a query is a short list of rare, known terms.
+
+        Such queries ("Fontainebleau", "NVDA") are answered well by the
+        inverted index alone, without a dense encoder pass.
+
+        Args:
+            query: Raw query text
+            max_terms: Maximum number of distinct terms
+            max_df_ratio: Maximum fraction of documents a term may appear in
+
+        Returns:
+            True if every term is indexed and rare
+        """
+        terms = set(tokenize(query))
+        if not terms or len(terms) > max_terms:
+            return False
+        max_df = max_df_ratio * len(self)
+        return all(term in self._postings and len(self._postings[term][0]) <= max_df for term in terms)
+
+    def save(self, path: Path):
+        """Persist the index as a single ``.npz`` file.
+
+        Args:
+            path: Destination path (should end in ``.npz``)
+        """
+        terms = list(self._postings)
+        postings = [self._postings[term] for term in terms]
+        offsets = np.cumsum([0] + [len(positions) for positions, _ in postings])
+        tmp_path = Path(path).with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            params=np.array([self.k1, self.b]),
+            terms=np.array(terms, dtype=str),
+            offsets=offsets,
+            positions=np.concatenate([positions for positions, _ in postings]) if postings else np.zeros(0, dtype=np.int32),
+            frequencies=np.concatenate([frequencies for _, frequencies in postings]) if postings else np.zeros(0, dtype=np.float32),
+            doc_lengths=self.doc_lengths,
+            keys=np.array(self.keys)
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['BM25Index']:
+        """Load an index saved with ``save``.
+
+        Args:
+            path: Path of the ``.npz`` file
+
+        Returns:
+            The index, or None if the file doesn't exist
+        """
+        if not Path(path).exists():
+            return None
+        with np.load(path) as data:
+            k1, b = data['params'].tolist()
+            index = cls(k1=k1, b=b)
+            offsets = data['offsets']
+            positions = np.split(data['positions'], offsets[1:-1])
+            frequencies = np.split(data['frequencies'], offsets[1:-1])
+            index._postings = dict(zip(data['terms'].tolist(), zip(positions, frequencies)))
+            index.doc_lengths = data['doc_lengths']
+            index.keys = data['keys'].tolist()
+        return index
@@ -0,0 +1,147 @@
+"""
+Persistent, content-addressed cache for document embeddings.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+import numpy as np
+from .storage import get_embedding_cache_path
+
+class EmbeddingCache:
+    """On-disk embedding cache keyed by (model name, SHA-256 of the text).
+
+    Entries live in a SQLite file and the least recently used ones are
+    evicted once the cache grows past ``max_entries``.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 500_000):
+        """Initialize the cache.
+
+        Args:
+            path: Path to the SQLite file; defaults to the storage directory
+            max_entries: Maximum number of cached vectors before LRU eviction
+        """
+        self.path = Path(path) if path is not None else get_embedding_cache_path()
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+            "last_used REAL NOT NULL, PRIMARY KEY (model, text_hash))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        """Hash the exact text that would be passed to the model."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, model_name: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Look up cached vectors for a list of texts.
+
+        Args:
+            model_name: Name of the embedding model
+            texts: Texts to look up
+
+        Returns:
+            List aligned with ``texts`` holding a vector or None for misses
+        """
+        hashes = [self._hash(text) for text in texts]
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(hashes), 500):
+                batch = list(set(hashes[start:start + 500]))
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model_name, *batch]
+                ).fetchall()
+                found.update({text_hash: np.frombuffer(vector, dtype=np.float32) for text_hash, vector in rows})
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model_name, text_hash) for text_hash in found]
+                )
+                self._conn.commit()
+
+        return [found.get(text_hash) for text_hash in hashes]
+
+    def put_many(self, model_name: str, texts: Sequence[str], vectors: np.ndarray):
+        """Store vectors for a list of texts, evicting old entries if needed.
+
+        Args:
+            model_name: Name of the embedding model
+            texts: Texts that were encoded
+            vectors: Embeddings aligned with ``texts``
+        """
+        now = time.time()
+        rows = [
+            (model_name, self._hash(text), np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+            # Evict least recently used entries beyond the size bound
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def encode(self, model, texts: Sequence[str], model_name: str, **encode_kwargs) -> np.ndarray:
+        """Encode texts, calling the model only for texts not in the cache.
+
+        Args:
+            model: SentenceTransformer used for cache misses
+            texts: Texts to encode
+            model_name: Name of the embedding model (part of the cache key)
+            **encode_kwargs: Extra arguments passed to ``model.encode``
+
+        Returns:
+            Numpy array of embeddings aligned with ``texts``
+        """
+        texts = list(texts)
+        vectors = self.get_many(model_name, texts)
+
+        # Encode each distinct missing text once
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            new_vectors = np.asarray(model.encode(missing, **encode_kwargs), dtype=np.float32)
+            self.put_many(model_name, missing, new_vectors)
+            encoded = dict(zip(missing, new_vectors))
+            vectors = [encoded[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+
+        if not vectors:
+            return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.vstack(vectors)
+
+_default_cache: Optional[EmbeddingCache] = None
+_default_cache_lock = threading.Lock()
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache shared by all engines.
+
+    Returns:
+        EmbeddingCache backed by the default storage location
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = EmbeddingCache()
+        return _default_cache
@@ -0,0 +1,176 @@
+"""
+Structured filters over columns parsed once at load time.
+"""
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+import numpy as np
+import pandas as pd
+
+NUMERIC = 'numeric'
+CATEGORICAL = 'categorical'
+
+# Operators accepted in numeric conditions, e.g. {'rating': {'gte': 4.5}}
+RANGE_OPERATORS = {
+    'gt': np.greater,
+    'gte': np.greater_equal,
+    'lt': np.less,
+    'lte': np.less_equal,
+}
+
+def parse_number(values: pd.Series) -> np.ndarray:
+    """Parse numbers that may carry separators or units ("2,699,423,838,000", "1.5%").
+
+    Values that don't parse ("N/A", missing) become NaN.
+    """
+    cleaned = values.astype(str).str.replace(r'[,$%\s]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=np.float64)
+
+def parse_price_level(values: pd.Series) -> np.ndarray:
+    """Parse price levels written as dollar signs ("$$$" is 3); missing values become NaN."""
+    counts = values.astype(str).str.count(r'\$').to_numpy(dtype=np.float64, copy=True)
+    counts[counts == 0] = np.nan
+    return counts
+
+def parse_category(values: pd.Series) -> np.ndarray:
+    """Case-fold category labels; missing values become None."""
+    labels = values.astype(str).str.strip().str.casefold().to_numpy(dtype=object, copy=True)
+    labels[values.isna().to_numpy()] = None
+    return labels
+
+# Filterable fields: name -> (kind, parser). Names are the CSV column names.
+HOTEL_FILTERS: Dict[str, Tuple[str, Callable[[pd.Series], np.ndarray]]] = {
+    'priceLevel': (NUMERIC, parse_price_level),
+    'rating': (NUMERIC, parse_number),
+    'hotelClass': (NUMERIC, parse_number),
+    'numberOfReviews': (NUMERIC, parse_number),
+    'type': (CATEGORICAL, parse_category),
+}
+STOCK_FILTERS: Dict[str, Tuple[str, Callable[[pd.Series], np.ndarray]]] = {
+    'sector': (CATEGORICAL, parse_category),
+    'industry': (CATEGORICAL, parse_category),
+    'market_cap': (NUMERIC, parse_number),
+    'beta': (NUMERIC, parse_number),
+}
+
+def normalize_filters(filters: Mapping[str, Any], fields: Mapping[str, Tuple[str, Callable]]) -> Dict[str, Any]:
+    """Validate filters and convert their values like the column data.
+
+    Numeric fields take a value (equality) or a dict of ``RANGE_OPERATORS``;
+    values are parsed with the field's parser, so ``{'priceLevel': {'lte': '$$'}}``
+    and ``{'market_cap': {'gte': '1,000,000,000'}}`` work. Categorical
+    fields take a label or a list of labels, matched case-insensitively.
+
+    Args:
+        filters: Filters keyed by field name
+        fields: Filterable fields of the engine
+
+    Returns:
+        Dictionary mapping each field to a range dict (numeric) or a list of
+        case-folded labels (categorical)
+
+    Raises:
+        ValueError: If a field or operator is unknown
+    """
+    normalized = {}
+    for name, condition in filters.items():
+        if name not in fields:
+            raise ValueError(f"Unknown filter field '{name}', expected one of {sorted(fields)}")
+        kind, parse = fields[name]
+        if kind == NUMERIC:
+            if not isinstance(condition, Mapping):
+                condition = {'gte': condition, 'lte': condition}
+            unknown = set(condition) - set(RANGE_OPERATORS)
+            if unknown:
+                raise ValueError(f"Unknown operators {sorted(unknown)} for '{name}', expected {list(RANGE_OPERATORS)}")
+            normalized[name] = {
+                operator: float(parse(pd.Series([value]))[0])
+                for operator, value in condition.items()
+            }
+        else:
+            labels = [condition] if isinstance(condition, str) else list(condition)
+            normalized[name] = [label for label in parse(pd.Series(labels)).tolist() if label is not None]
+    return normalized
+
+def filter_payloads(df: pd.DataFrame, fields: Mapping[str, Tuple[str, Callable]]) -> List[Dict[str, Any]]:
+    """Parse the filterable fields of each row for storage in a vector database payload.
+
+    Args:
+        df: Rows to parse
+        fields: Filterable fields of the engine
+
+    Returns:
+        One dictionary per row with parsed values (None when missing)
+    """
+    columns = {}
+    for name, (kind, parse) in fields.items():
+        values = parse(df[name]) if name in df.columns else np.full(len(df), None, dtype=object)
+        if kind == NUMERIC:
+            values = [None if pd.isna(value) else float(value) for value in values]
+        columns[name] = values
+    return [dict(zip(columns, row)) for row in zip(*columns.values())] if columns else [{} for _ in range(len(df))]
+
+class ColumnStore:
+    """Filterable columns parsed once, evaluated as vectorized boolean masks.
+
+    Numeric fields are kept as float arrays (NaN when missing) and
+    categorical fields as integer codes, so a filter costs a few array
+    comparisons instead of per-row Python checks.
+    """
+
+    def __init__(self, fields: Mapping[str, Tuple[str, Callable]]):
+        """Initialize an empty store.
+
+        Args:
+            fields: Filterable fields, mapping name to (kind, parser)
+        """
+        self.fields = dict(fields)
+        self.num_rows = 0
+        self.columns: Dict[str, np.ndarray] = {}
+        self._categories: Dict[str, Dict[str, int]] = {}
+        for name, (kind, _) in self.fields.items():
+            self.columns[name] = np.zeros(0, dtype=np.float64 if kind == NUMERIC else np.int32)
+            if kind == CATEGORICAL:
+                self._categories[name] = {}
+
+    def add(self, df: pd.DataFrame):
+        """Parse and append the filterable columns of new rows.
+
+        Args:
+            df: New rows, in the same order as the engine's data
+        """
+        for name, (kind, parse) in self.fields.items():
+            if name in df.columns:
+                values = parse(df[name])
+            else:
+                values = np.full(len(df), np.nan if kind == NUMERIC else None, dtype=np.float64 if kind == NUMERIC else object)
+
+            if kind == CATEGORICAL:
+                codes, uniques = pd.factorize(values)
+                categories = self._categories[name]
+                remap = np.array([categories.setdefault(label, len(categories)) for label in uniques], dtype=np.int32)
+                values = np.full(len(codes), -1, dtype=np.int32)
+                present = codes >= 0
+                values[present] = remap[codes[present]]
+
+            self.columns[name] = np.concatenate([self.columns[name], values])
+        self.num_rows += len(df)
+
+    def mask(self, filters: Mapping[str, Any]) -> np.ndarray:
+        """Evaluate filters over all rows.
+
+        Args:
+            filters: Filters as accepted by ``normalize_filters``
+
+        Returns:
+            Boolean array marking the rows that satisfy every filter; rows
+            with a missing value never match a condition on that field
+        """
+        mask = np.ones(self.num_rows, dtype=bool)
+        for name, condition in normalize_filters(filters, self.fields).items():
+            column = self.columns[name]
+            if self.fields[name][0] == NUMERIC:
+                for operator, value in condition.items():
+                    mask &= RANGE_OPERATORS[operator](column, value)
+            else:
+                codes = [self._categories[name][label] for label in condition if label in self._categories[name]]
+                mask &= np.isin(column, codes)
+        return mask
@@ -0,0 +1,52 @@
+"""
+Fingerprints identifying the inputs an index was built from.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Iterable, List
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    """Hash a file's contents.
+
+    Args:
+        path: Path of the file
+        block_size: Bytes read per step, so large files are never loaded whole
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(Path(path), 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def text_hashes(texts: Iterable[str]) -> List[str]:
+    """Hash texts individually, e.g. the embedding text of each row.
+
+    Args:
+        texts: Texts to hash
+
+    Returns:
+        Hex digest per text
+    """
+    return [hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest() for text in texts]
+
+def dataset_fingerprint(data_path: str, model_key: str, schema: Any) -> str:
+    """Fingerprint the source data, embedding model and document schema of an index.
+
+    Any change to the file contents, the model (or its backend) or the
+    schema yields a different fingerprint, so an index tagged with it can
+    be checked for staleness without reading its contents.
+
+    Args:
+        data_path: Path of the source CSV
+        model_key: Key identifying the embedding model and backend
+        schema: JSON-serializable description of the text and payload fields
+
+    Returns:
+        Short hex fingerprint, safe to use in collection and file names
+    """
+    parts = json.dumps([file_digest(data_path), model_key, schema], sort_keys=True)
+    return hashlib.blake2b(parts.encode('utf-8'), digest_size=8).hexdigest()
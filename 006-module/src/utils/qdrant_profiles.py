@@ -0,0 +1,186 @@
+"""
+Named Qdrant collection profiles, client setup and versioned collections.
+"""
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from .storage import get_qdrant_path
+
+# Server default, restored when a collection doesn't report its threshold
+DEFAULT_INDEXING_THRESHOLD = 20000
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Collection storage/index settings and the matching search parameters."""
+    name: str
+    hnsw_m: int = 16  # Graph out-degree
+    hnsw_ef_construct: int = 200  # Candidate list size while building the graph
+    hnsw_on_disk: bool = False  # Keep the graph on disk (memory-mapped)
+    vectors_on_disk: bool = False  # Keep original float32 vectors on disk (memory-mapped)
+    on_disk_payload: bool = False  # Keep payloads on disk; indexed payload fields stay in RAM
+    quantization: bool = True  # Int8 scalar quantization of vectors
+    quantile: float = 0.99  # Quantile of vector values used to fix the int8 range
+    search_hnsw_ef: int = 64  # Candidate list size while searching
+    oversampling: float = 1.5  # Quantized candidates fetched per result before rescoring
+    rescore: bool = True  # Re-score quantized candidates with the original vectors
+
+    def vectors_config(self, size: int) -> models.VectorParams:
+        """Vector parameters for a cosine collection of the given dimension."""
+        return models.VectorParams(size=size, distance=models.Distance.COSINE, on_disk=self.vectors_on_disk)
+
+    def hnsw_config(self) -> models.HnswConfigDiff:
+        """HNSW graph parameters."""
+        return models.HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct, on_disk=self.hnsw_on_disk)
+
+    def quantization_config(self) -> Optional[models.ScalarQuantization]:
+        """Int8 scalar quantization with quantized vectors pinned in RAM, or None."""
+        if not self.quantization:
+            return None
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=self.quantile, always_ram=True)
+        )
+
+    def search_params(self) -> models.SearchParams:
+        """Search-time parameters matching the collection settings."""
+        return models.SearchParams(
+            hnsw_ef=self.search_hnsw_ef,
+            quantization=models.QuantizationSearchParams(rescore=self.rescore, oversampling=self.oversampling)
+            if self.quantization else None
+        )
+
+    def create_collection(self, client: QdrantClient, collection_name: str, size: int):
+        """Create a collection with this profile's settings.
+
+        Args:
+            client: Qdrant client
+            collection_name: Name of the collection to create
+            size: Vector dimension
+        """
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=self.vectors_config(size),
+            hnsw_config=self.hnsw_config(),
+            quantization_config=self.quantization_config(),
+            on_disk_payload=self.on_disk_payload
+        )
+
+COLLECTION_PROFILES: Dict[str, CollectionProfile] = {
+    # Everything in RAM; int8 vectors score candidates, originals rescore them
+    'latency': CollectionProfile(name='latency'),
+    # Only the int8 vectors and payload indexes stay in RAM (about a quarter
+    # of the float32 footprint); a wider search and more oversampling with
+    # rescoring against the memory-mapped originals keep recall
+    'memory': CollectionProfile(
+        name='memory',
+        hnsw_ef_construct=100,
+        hnsw_on_disk=True,
+        vectors_on_disk=True,
+        on_disk_payload=True,
+        search_hnsw_ef=128,
+        oversampling=2.0
+    ),
+}
+
+def get_collection_profile(name: str = 'latency') -> CollectionProfile:
+    """Look up a named collection profile.
+
+    Args:
+        name: One of ``COLLECTION_PROFILES``
+
+    Returns:
+        The profile
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if name not in COLLECTION_PROFILES:
+        raise ValueError(f"Unknown collection profile '{name}', expected one of {list(COLLECTION_PROFILES)}")
+    return COLLECTION_PROFILES[name]
+
+def get_qdrant_client() -> QdrantClient:
+    """Connect to the Qdrant server at ``QDRANT_URL``, or open the local store.
+
+    Local mode searches exactly and ignores HNSW, quantization and on-disk
+    settings; profiles take effect on a server.
+
+    Returns:
+        Qdrant client
+    """
+    url = os.getenv("QDRANT_URL")
+    if url:
+        return QdrantClient(url=url, api_key=os.getenv("QDRANT_API_KEY"))
+    return QdrantClient(path=str(get_qdrant_path()))
+
+@contextmanager
+def deferred_indexing(client: QdrantClient, collection_name: str) -> Iterator[None]:
+    """Suspend HNSW indexing of a collection while it is bulk loaded.
+
+    Uploaded vectors are only appended to segments; the graph is built
+    once when the previous indexing threshold is restored, instead of
+    being updated point by point during the load. Local mode has no
+    optimizer and ignores this.
+
+    Args:
+        client: Qdrant client
+        collection_name: Name of the collection being loaded
+    """
+    threshold = client.get_collection(collection_name).config.optimizer_config.indexing_threshold
+    if threshold is None:
+        threshold = DEFAULT_INDEXING_THRESHOLD
+    client.update_collection(collection_name, optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0))
+    try:
+        yield
+    finally:
+        client.update_collection(collection_name, optimizers_config=models.OptimizersConfigDiff(indexing_threshold=threshold))
+
+def get_alias_target(client: QdrantClient, alias_name: str) -> Optional[str]:
+    """Get the collection an alias points to.
+
+    Args:
+        client: Qdrant client
+        alias_name: Name of the alias
+
+    Returns:
+        Collection name, or None if the alias doesn't exist
+    """
+    for alias in client.get_aliases().aliases:
+        if alias.alias_name == alias_name:
+            return alias.collection_name
+    return None
+
+def swap_alias(client: QdrantClient, alias_name: str, collection_name: str) -> Optional[str]:
+    """Point an alias at a fully built collection and drop the one it replaces.
+
+    The alias is moved in a single aliases update, so searches through it
+    hit either the old or the new collection, never a missing or partial one.
+
+    Args:
+        client: Qdrant client
+        alias_name: Name of the alias searches use
+        collection_name: Collection the alias should point to
+
+    Returns:
+        Name of the dropped collection, or None
+    """
+    previous = get_alias_target(client, alias_name)
+    operations = []
+    if previous is not None:
+        operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias_name)))
+    elif client.collection_exists(alias_name):
+        # Collections created before versioning carry the alias name itself and
+        # must be dropped before the alias can take it; this one-time switch isn't atomic
+        client.delete_collection(alias_name)
+        previous = alias_name
+    operations.append(models.CreateAliasOperation(
+        create_alias=models.CreateAlias(collection_name=collection_name, alias_name=alias_name)
+    ))
+    client.update_collection_aliases(change_aliases_operations=operations)
+
+    if previous is None or previous == collection_name:
+        return None
+    if previous != alias_name:
+        client.delete_collection(previous)
+    return previous
@@ -0,0 +1,149 @@
+"""
+In-memory LRU cache for query embeddings.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+class QueryEmbeddingCache:
+    """Bounded, thread-safe LRU cache of query vectors.
+
+    Entries are keyed by model key and normalized query text (case folded,
+    whitespace collapsed), and the normalized text is what gets encoded, so
+    "AAPL", "aapl" and " aapl " share one vector. Cached vectors are
+    read-only and shared between callers.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached queries before LRU eviction
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[str, str], np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Fold case and collapse whitespace in a query."""
+        return " ".join(query.casefold().split())
+
+    def get(self, model_key: str, query: str) -> Optional[np.ndarray]:
+        """Look up the vector for a query.
+
+        Args:
+            model_key: Key of the model/backend that produced the vector
+            query: Raw query text
+
+        Returns:
+            Cached vector or None
+        """
+        key = (model_key, self.normalize(query))
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, model_key: str, query: str, vector: np.ndarray) -> np.ndarray:
+        """Store the vector for a query, evicting the oldest entry if needed.
+
+        Args:
+            model_key: Key of the model/backend that produced the vector
+            query: Raw query text
+            vector: Query embedding
+
+        Returns:
+            The read-only cached vector
+        """
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        key = (model_key, self.normalize(query))
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return vector
+
+    def encode(self, model, query: str, model_key: str) -> np.ndarray:
+        """Get a query vector, encoding the normalized query on a miss.
+
+        Args:
+            model: SentenceTransformer used on a miss
+            query: Raw query text
+            model_key: Key of the model/backend (part of the cache key)
+
+        Returns:
+            Read-only query embedding
+        """
+        vector = self.get(model_key, query)
+        if vector is None:
+            vector = self.put(model_key, query, model.encode(self.normalize(query)))
+        return vector
+
+    def encode_many(self, model, queries: List[str], model_key: str, **encode_kwargs) -> np.ndarray:
+        """Get vectors for many queries, encoding all misses in one batch.
+
+        Args:
+            model: SentenceTransformer used for misses
+            queries: Raw query texts
+            model_key: Key of the model/backend (part of the cache key)
+            **encode_kwargs: Extra arguments passed to ``model.encode``
+
+        Returns:
+            Numpy array of query embeddings aligned with ``queries``
+        """
+        vectors = [self.get(model_key, query) for query in queries]
+
+        # Encode each distinct missing query once
+        missing = list(dict.fromkeys(self.normalize(query) for query, vector in zip(queries, vectors) if vector is None))
+        if missing:
+            new_vectors = model.encode(missing, **encode_kwargs)
+            encoded = {text: self.put(model_key, text, vector) for text, vector in zip(missing, new_vectors)}
+            vectors = [encoded[self.normalize(query)] if vector is None else vector
+                       for query, vector in zip(queries, vectors)]
+
+        if not vectors:
+            return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and the current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+            }
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+_default_cache: Optional[QueryEmbeddingCache] = None
+_default_cache_lock = threading.Lock()
+
+def get_query_cache() -> QueryEmbeddingCache:
+    """Get the process-wide query embedding cache shared by all engines.
+
+    Returns:
+        QueryEmbeddingCache with the default size bound
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = QueryEmbeddingCache()
+        return _default_cache
@@ -0,0 +1,193 @@
+"""
+Cross-encoder re-ranking of a bounded candidate list.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sentence_transformers import CrossEncoder
+
+@dataclass
+class RerankConfig:
+    """Re-ranking parameters."""
+    model_name: str = 'cross-encoder/ms-marco-MiniLM-L-6-v2'
+    candidates: int = 20  # Top-ranked candidates re-scored per query
+    time_budget_ms: Optional[float] = 100.0  # Fewer candidates are re-scored when the estimate exceeds this; None disables
+    batch_size: int = 32  # Pairs per forward pass
+    max_length: int = 256  # Tokens per (query, document) pair
+
+class CrossEncoderReranker:
+    """Lazily loaded, thread-safe cross-encoder with a (query, document) score cache.
+
+    All uncached pairs of a call are scored in one batched ``predict``.
+    Per-pair latency is tracked so a call can trim its candidate lists to
+    fit a time budget before running the model.
+    """
+
+    def __init__(self, model_name: str, max_length: int = 256, max_cache_entries: int = 50_000):
+        """Initialize the handle without loading the model.
+
+        Args:
+            model_name: Name or path of the CrossEncoder model
+            max_length: Tokens per (query, document) pair
+            max_cache_entries: Maximum number of cached pair scores before LRU eviction
+        """
+        self.model_name = model_name
+        self.max_length = max_length
+        self.max_cache_entries = max_cache_entries
+        self.hits = 0
+        self.misses = 0
+        self._model = None
+        self._seconds_per_pair: Optional[float] = None
+        self._cache: 'OrderedDict[Tuple[str, bytes], float]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def model(self) -> CrossEncoder:
+        """The loaded CrossEncoder, loading it on first access."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = CrossEncoder(self.model_name, max_length=self.max_length)
+        return self._model
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Fold case and collapse whitespace in a query."""
+        return " ".join(query.casefold().split())
+
+    @staticmethod
+    def _cache_key(query: str, document: str) -> Tuple[str, bytes]:
+        return query, hashlib.blake2b(document.encode('utf-8'), digest_size=16).digest()
+
+    def _affordable_depth(self, keys: List[List[Tuple[str, bytes]]], time_budget_ms: Optional[float]) -> int:
+        """Largest per-query candidate count whose uncached pairs fit the time budget."""
+        depth = max((len(query_keys) for query_keys in keys), default=0)
+        if time_budget_ms is None or self._seconds_per_pair is None:
+            return depth
+        max_pairs = int(time_budget_ms / 1000 / self._seconds_per_pair)
+        with self._lock:
+            uncached = np.zeros(depth + 1, dtype=np.int64)
+            for query_keys in keys:
+                misses = np.array([key not in self._cache for key in query_keys], dtype=np.int64)
+                counts = np.concatenate([[0], np.cumsum(misses)])
+                uncached += np.concatenate([counts, np.full(depth + 1 - len(counts), counts[-1])])
+        return int(np.flatnonzero(uncached <= max_pairs)[-1])
+
+    def rerank_many(self, queries: Sequence[str], documents: Sequence[Sequence[str]],
+                    config: RerankConfig) -> List[np.ndarray]:
+        """Score the leading candidates of several queries in one batched pass.
+
+        Args:
+            queries: Raw query texts
+            documents: Candidate document texts per query, best first
+            config: Re-ranking parameters
+
+        Returns:
+            Cross-encoder scores per query for its first ``n`` documents,
+            where ``n`` is at most ``config.candidates`` and smaller if the
+            time budget doesn't allow more (possibly 0)
+        """
+        queries = [self.normalize(query) for query in queries]
+        keys = [
+            [self._cache_key(query, document) for document in query_documents[:config.candidates]]
+            for query, query_documents in zip(queries, documents)
+        ]
+        depth = self._affordable_depth(keys, config.time_budget_ms)
+        keys = [query_keys[:depth] for query_keys in keys]
+
+        # Score each distinct uncached pair once
+        with self._lock:
+            scores: Dict[Tuple[str, bytes], float] = {}
+            pairs = {}
+            for query, query_documents, query_keys in zip(queries, documents, keys):
+                for document, key in zip(query_documents, query_keys):
+                    if key in self._cache:
+                        self._cache.move_to_end(key)
+                        scores[key] = self._cache[key]
+                        self.hits += 1
+                    elif key not in pairs:
+                        pairs[key] = (query, document)
+                        self.misses += 1
+
+        if pairs:
+            model = self.model
+            # Serialized like SharedEncoder.encode: fast tokenizers aren't thread-safe
+            with self._lock:
+                start = time.perf_counter()
+                predictions = model.predict(list(pairs.values()), batch_size=config.batch_size, show_progress_bar=False)
+                elapsed = (time.perf_counter() - start) / len(pairs)
+
+                # Moving average of per-pair latency drives the budget estimate
+                self._seconds_per_pair = elapsed if self._seconds_per_pair is None else 0.8 * self._seconds_per_pair + 0.2 * elapsed
+                for key, score in zip(pairs, np.asarray(predictions, dtype=np.float32).reshape(-1).tolist()):
+                    scores[key] = score
+                    self._cache[key] = score
+                while len(self._cache) > self.max_cache_entries:
+                    self._cache.popitem(last=False)
+
+        return [np.array([scores[key] for key in query_keys], dtype=np.float32) for query_keys in keys]
+
+    def rerank(self, query: str, documents: Sequence[str], config: RerankConfig) -> np.ndarray:
+        """Score the leading candidates of one query.
+
+        Args:
+            query: Raw query text
+            documents: Candidate document texts, best first
+            config: Re-ranking parameters
+
+        Returns:
+            Cross-encoder scores for the first ``n`` documents, as in ``rerank_many``
+        """
+        return self.rerank_many([query], [documents], config)[0]
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache hit/miss counters, the cache size and the per-pair latency estimate."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._cache),
+                'ms_per_pair': self._seconds_per_pair * 1000 if self._seconds_per_pair is not None else None,
+            }
+
+_rerankers: Dict[Tuple[str, int], CrossEncoderReranker] = {}
+_rerankers_lock = threading.Lock()
+
+def get_reranker(model_name: str = 'cross-encoder/ms-marco-MiniLM-L-6-v2', max_length: int = 256) -> CrossEncoderReranker:
+    """Get the process-wide reranker for a model.
+
+    Every engine asking for the same model receives the same instance, so
+    weights are loaded once per process and the score cache is shared.
+
+    Args:
+        model_name: Name or path of the CrossEncoder model
+        max_length: Tokens per (query, document) pair
+
+    Returns:
+        Shared, lazily loaded reranker
+    """
+    key = (model_name, max_length)
+    with _rerankers_lock:
+        if key not in _rerankers:
+            _rerankers[key] = CrossEncoderReranker(*key)
+        return _rerankers[key]
+
+def apply_rerank(ranked: List[Tuple[Any, float]], scores: np.ndarray) -> List[Tuple[Any, float]]:
+    """Reorder the leading entries of a ranking by cross-encoder score.
+
+    Args:
+        ranked: (key, score) pairs, best first
+        scores: Cross-encoder scores for the first ``len(scores)`` entries
+
+    Returns:
+        The re-scored entries sorted by cross-encoder score, followed by
+        the remaining entries with their original scores
+    """
+    order = np.argsort(-scores, kind='stable')
+    return [(ranked[i][0], float(scores[i])) for i in order] + list(ranked[len(scores):])
@@ -0,0 +1,112 @@
+"""
+Cosine scoring over pre-normalized embeddings.
+"""
+import threading
+from typing import Optional, Tuple
+import numpy as np
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize embedding rows.
+
+    Args:
+        embeddings: Array of shape (num_vectors, dim)
+
+    Returns:
+        C-contiguous float32 array with unit-length rows (all-zero rows stay zero)
+    """
+    embeddings = np.array(embeddings, dtype=np.float32, order='C', ndmin=2)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+    return embeddings
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Get the indices of the ``top_k`` highest scores.
+
+    Uses ``argpartition`` to find the candidates in linear time and only
+    sorts those.
+
+    Args:
+        scores: Scores of shape (num_documents,) or (num_queries, num_documents)
+        top_k: Number of indices to keep per row
+
+    Returns:
+        Indices sorted by descending score, of shape (k,) or (num_queries, k)
+        with ``k = min(top_k, num_documents)``
+    """
+    num_documents = scores.shape[-1]
+    k = min(top_k, num_documents)
+    if k <= 0:
+        return np.zeros(scores.shape[:-1] + (0,), dtype=np.int64)
+    candidates = np.argpartition(scores, num_documents - k, axis=-1)[..., num_documents - k:]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=-1), axis=-1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=-1)
+
+class DotProductScorer:
+    """Score queries against a corpus by cosine similarity.
+
+    Corpus vectors are normalized once, when they are added, so a query is
+    scored with a single dot product instead of re-normalizing the corpus
+    on every call. Scores are written into a per-thread buffer that is
+    reused across calls.
+    """
+
+    def __init__(self, embeddings: np.ndarray, normalized: bool = False):
+        """Initialize the scorer.
+
+        Args:
+            embeddings: Corpus embeddings of shape (num_documents, dim)
+            normalized: The rows are already unit length; C-contiguous
+                float32 input (e.g. a read-only memory map) is then used
+                without a copy
+        """
+        if normalized and embeddings.dtype == np.float32 and embeddings.ndim == 2 and embeddings.flags.c_contiguous:
+            self.embeddings = embeddings
+        else:
+            self.embeddings = normalize_embeddings(embeddings)
+        self._local = threading.local()
+
+    def add(self, embeddings: np.ndarray):
+        """Append corpus embeddings.
+
+        Args:
+            embeddings: New embeddings of shape (num_new, dim)
+        """
+        self.embeddings = np.vstack([self.embeddings, normalize_embeddings(embeddings)])
+
+    def _buffer(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """Get this thread's score buffer, viewed with the given shape."""
+        size = int(np.prod(shape))
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or buffer.size < size:
+            buffer = np.empty(size, dtype=np.float32)
+            self._local.buffer = buffer
+        return buffer[:size].reshape(shape)
+
+    def score(self, query: np.ndarray) -> np.ndarray:
+        """Score one query against the corpus.
+
+        Args:
+            query: Query embedding of shape (dim,)
+
+        Returns:
+            Cosine similarities of shape (num_documents,). The array is this
+            thread's reusable buffer and is overwritten by the next call.
+        """
+        query = normalize_embeddings(query)[0]
+        return np.dot(self.embeddings, query, out=self._buffer((len(self.embeddings),)))
+
+    def score_batch(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score several queries against the corpus with one matrix multiply.
+
+        Args:
+            queries: Query embeddings of shape (num_queries, dim)
+            rows: Optional corpus row indices to restrict scoring to
+
+        Returns:
+            Cosine similarities of shape (num_queries, num_documents), or
+            (num_queries, len(rows)) when ``rows`` is given. The array is
+            this thread's reusable buffer and is overwritten by the next call.
+        """
+        queries = normalize_embeddings(queries)
+        embeddings = self.embeddings if rows is None else self.embeddings[rows]
+        return np.dot(queries, embeddings.T, out=self._buffer((len(queries), len(embeddings))))
@@ -0,0 +1,101 @@
+"""
+Exact ticker and company-name lookup index.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Upper-case tickers with an optional share-class suffix (e.g. AAPL, BRK.B, AAIC^B)
+TICKER_PATTERN = re.compile(r'[A-Z]{1,5}(?:[.^/-][A-Z0-9]{1,2})?')
+
+# Where the security description starts in a listing name ("Apple Inc. Common Stock")
+SECURITY_MARKERS = re.compile(
+    r'\b(?:common stock|common shares|ordinary shares|class [a-z]|american depositary|depositary'
+    r'|warrants?|units?|rights?|preferred|series [a-z]|shares of beneficial interest)\b'
+)
+
+# Legal-form words dropped from the end of a company name
+CORPORATE_SUFFIXES = {
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'ltd', 'limited',
+    'plc', 'llc', 'lp', 'sa', 'nv', 'ag'
+}
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+class SymbolIndex:
+    """Hash index from tickers and normalized company names to stock keys.
+
+    Keys are whatever the owning engine uses to fetch a stock (a row
+    position, a Qdrant point id, ...). Lookups are dictionary hits, so
+    ticker and exact-name queries resolve without the encoder.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._symbols: Dict[str, Any] = {}
+        self._names: Dict[str, List[Tuple[int, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    @staticmethod
+    def looks_like_ticker(query: str) -> bool:
+        """Check whether a query is written as a ticker ("AAPL" or "$aapl")."""
+        query = query.strip()
+        if query.startswith('$'):
+            query = query[1:].upper()
+        return TICKER_PATTERN.fullmatch(query) is not None
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """Fold case and reduce punctuation and whitespace to single spaces."""
+        return _NON_ALNUM.sub(' ', str(name).casefold()).strip()
+
+    @staticmethod
+    def core_name(normalized: str) -> str:
+        """Strip the security description and legal form from a normalized name.
+
+        "apple inc common stock" becomes "apple".
+        """
+        marker = SECURITY_MARKERS.search(normalized)
+        words = (normalized[:marker.start()] if marker else normalized).split()
+        while words and words[-1] in CORPORATE_SUFFIXES:
+            words.pop()
+        return ' '.join(words)
+
+    def add(self, symbols: Iterable[Any], names: Iterable[Any], keys: Iterable[Any]):
+        """Index stocks.
+
+        Args:
+            symbols: Ticker symbols
+            names: Listing names aligned with ``symbols``
+            keys: Keys returned by ``lookup``, aligned with ``symbols``
+        """
+        for symbol, name, key in zip(symbols, names, keys):
+            if isinstance(symbol, str) and symbol:
+                self._symbols.setdefault(symbol.upper(), key)
+            if not isinstance(name, str) or not name:
+                continue
+            normalized = self.normalize_name(name)
+            # Shorter listing names (usually the common stock) rank first
+            for variant in {normalized, self.core_name(normalized)}:
+                if variant:
+                    self._names.setdefault(variant, []).append((len(normalized), key))
+                    self._names[variant].sort(key=lambda entry: entry[0])
+
+    def lookup(self, query: str) -> List[Any]:
+        """Resolve a ticker or exact company name.
+
+        Args:
+            query: Raw query text
+
+        Returns:
+            Keys of the matching stocks, best match first; empty if the
+            query is neither a known ticker nor a known name
+        """
+        if self.looks_like_ticker(query):
+            key = self._symbols.get(query.strip().lstrip('$').upper())
+            if key is not None:
+                return [key]
+        normalized = self.normalize_name(query)
+        entries = self._names.get(normalized) or self._names.get(self.core_name(normalized)) or []
+        return [key for _, key in entries]